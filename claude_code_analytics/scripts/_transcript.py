@@ -0,0 +1,53 @@
+"""Shared session/transcript lookup helpers for the analysis scripts."""
+
+import functools
+import sqlite3
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=4)
+def _connect(db_path: str) -> sqlite3.Connection:
+    """
+    One shared connection per database path and process.
+
+    The lookups here only ever SELECT, so the database is opened in URI
+    read-only mode with query_only set - no reserved locks, and parallel
+    lookups from the bulk --project mode don't serialize on the writer
+    lock. check_same_thread=False lets worker threads share the handle
+    (SQLite is compiled in serialized mode, so that's safe for reads).
+    """
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA mmap_size=268435456")
+    except sqlite3.OperationalError:
+        # Database missing or unreadable: fall back to a normal connection
+        # so callers get the usual empty-result path instead of a crash
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+    return conn
+
+
+@functools.lru_cache(maxsize=256)
+def lookup_project_id(session_id: str, db_path: str) -> Optional[str]:
+    """
+    Look up the project ID a session belongs to.
+
+    Cached so repeated lookups (REPL use, bulk runs) cost a dict hit
+    instead of a query, on top of the shared connection.
+
+    Args:
+        session_id: Session UUID
+        db_path: Path to SQLite database
+
+    Returns:
+        Project ID or None if the session is unknown
+    """
+    cursor = _connect(db_path).execute("""
+        SELECT p.project_id
+        FROM sessions s
+        JOIN projects p ON s.project_id = p.project_id
+        WHERE s.session_id = ?
+    """, (session_id,))
+
+    row = cursor.fetchone()
+    return row[0] if row else None
@@ -19,15 +19,19 @@ Usage:
 """
 
 import argparse
+import hashlib
+import json
 import sqlite3
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict
+from typing import List, Optional, Dict
 from dotenv import load_dotenv
 import yaml
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
 
+from claude_code_analytics.scripts._transcript import lookup_project_id
 from claude_code_analytics.streamlit_app.services.llm_providers import create_provider, OpenRouterProvider
 
 # Load environment variables from .env file
@@ -49,8 +53,15 @@ def load_prompts() -> tuple[Dict[str, str], Environment]:
     with open(metadata_file, 'r') as f:
         metadata = yaml.safe_load(f)
 
-    # Create Jinja2 environment
-    env = Environment(loader=FileSystemLoader(str(prompts_dir)))
+    # Create Jinja2 environment with a persistent bytecode cache so
+    # repeated CLI invocations skip template re-parse entirely
+    bytecode_dir = Path.home() / '.cache' / 'claude-jinja'
+    bytecode_dir.mkdir(parents=True, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(str(prompts_dir)),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(directory=str(bytecode_dir)),
+    )
 
     return metadata, env
 
@@ -58,45 +69,98 @@ def load_prompts() -> tuple[Dict[str, str], Environment]:
 # Load prompt metadata and Jinja2 environment
 PROMPT_METADATA, JINJA_ENV = load_prompts()
 
+# On-disk cache of LLM responses, next to the transcripts/database
+ANALYSIS_CACHE_DIR = Path.home() / "claude-conversations" / "analysis_cache"
+
+# Prompt templates are static apart from the {{ transcript }} slot, so
+# render each one once around a sentinel and reuse the (prefix, suffix)
+# halves - per-session prompt assembly becomes a single concatenation
+# instead of a full template render (matters for --project bulk runs)
+_TRANSCRIPT_SENTINEL = "\x00TRANSCRIPT\x00"
+_PROMPT_PARTS: Dict[str, tuple] = {}
+
+
+def _get_prompt_parts(analysis_type: str, template_file: str) -> tuple:
+    """Get the rendered (prefix, suffix) around the transcript slot."""
+    parts = _PROMPT_PARTS.get(analysis_type)
+    if parts is None:
+        template = JINJA_ENV.get_template(template_file)
+        rendered = template.render(transcript=_TRANSCRIPT_SENTINEL)
+        prefix, _, suffix = rendered.partition(_TRANSCRIPT_SENTINEL)
+        parts = (prefix, suffix)
+        _PROMPT_PARTS[analysis_type] = parts
+    return parts
+
+
+def _cached_analysis_path(prompt: str, model_name: str) -> Path:
+    """
+    Cache file path for a (prompt, model) pair, keyed by content hash.
+
+    Whitespace runs are collapsed before hashing so a transcript that was
+    re-pretty-printed with only formatting differences (extra blank lines,
+    trailing spaces) still hits the cache.
+    """
+    normalized = ' '.join(prompt.split())
+    key = hashlib.sha256(f"{model_name}\x00{normalized}".encode('utf-8')).hexdigest()
+    return ANALYSIS_CACHE_DIR / f"{key}.json"
+
+
+def _load_cached_analysis(cache_path: Path) -> Optional[str]:
+    """Return a cached analysis, or None on miss/corruption."""
+    if not cache_path.exists():
+        return None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)['response']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store_cached_analysis(cache_path: Path, response: str, model_name: str) -> None:
+    """Write an analysis to the cache atomically (write temp, then rename)."""
+    from datetime import datetime
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        'response': response,
+        'model_name': model_name,
+        'timestamp': datetime.now().isoformat(),
+    }
+    tmp_path = cache_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, cache_path)
+
 
-def get_session_transcript(session_id: str, db_path: str) -> Optional[str]:
+def get_session_transcript(session_id: str, db_path: str, save_transcript: bool = False) -> Optional[str]:
     """
-    Get the pretty-printed transcript for a session.
+    Get the pretty-printed transcript text for a session.
+
+    An existing transcript file under ~/claude-conversations/ is read
+    directly; otherwise the pretty-print script's stdout is captured in
+    memory, avoiding a write-then-read round-trip through disk. Pass
+    save_transcript=True to also persist the generated text.
 
     Args:
         session_id: Session UUID
         db_path: Path to SQLite database
+        save_transcript: Persist a freshly generated transcript to disk
 
     Returns:
-        Transcript file path or None if not found
+        Transcript text or None if not found
     """
-    # Check if transcript already exists in ~/claude-conversations/
     conversations_dir = Path.home() / "claude-conversations"
 
-    # Get project info from database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT p.project_id, p.project_name
-        FROM sessions s
-        JOIN projects p ON s.project_id = p.project_id
-        WHERE s.session_id = ?
-    """, (session_id,))
-
-    result = cursor.fetchone()
-    conn.close()
-
-    if not result:
+    # Get project info from database (shared cached lookup)
+    project_id = lookup_project_id(session_id, db_path)
+    if not project_id:
         return None
 
-    project_id, project_name = result
-
-    # Look for existing transcript
+    # Fast path: transcript already on disk
     project_dir = conversations_dir / project_id
-    if project_dir.exists():
-        transcript_file = project_dir / f"{session_id}.txt"
-        if transcript_file.exists():
-            return str(transcript_file)
+    transcript_file = project_dir / f"{session_id}.txt"
+    if transcript_file.exists():
+        return transcript_file.read_text(encoding='utf-8')
 
     # If not found, generate it
     claude_projects = Path.home() / ".claude" / "projects"
@@ -106,39 +170,44 @@ def get_session_transcript(session_id: str, db_path: str) -> Optional[str]:
         print(f"❌ JSONL file not found: {jsonl_file}", file=sys.stderr)
         return None
 
-    # Create output directory
-    project_dir.mkdir(parents=True, exist_ok=True)
-    output_file = project_dir / f"{session_id}.txt"
-
-    # Run pretty-print script
+    # Run pretty-print script, capturing stdout straight into memory
     print(f"📄 Generating transcript from {jsonl_file}...")
     pretty_print_script = Path.home() / ".claude" / "scripts" / "pretty-print-transcript.py"
 
     import subprocess
     try:
-        with open(output_file, 'w') as f:
-            subprocess.run([str(pretty_print_script), str(jsonl_file)], stdout=f, check=True)
-        print(f"✅ Transcript saved to {output_file}")
-        return str(output_file)
+        result = subprocess.run(
+            [str(pretty_print_script), str(jsonl_file)],
+            capture_output=True, check=True, text=True
+        )
     except subprocess.CalledProcessError as e:
         print(f"❌ Error generating transcript: {e}", file=sys.stderr)
         return None
 
+    if save_transcript:
+        project_dir.mkdir(parents=True, exist_ok=True)
+        transcript_file.write_text(result.stdout, encoding='utf-8')
+        print(f"✅ Transcript saved to {transcript_file}")
+
+    return result.stdout
+
 
 def analyze_with_llm(
-    transcript_path: str,
+    transcript: str,
     analysis_type: str,
     custom_prompt: Optional[str] = None,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    use_cache: bool = True
 ) -> str:
     """
     Analyze transcript using configured LLM provider.
 
     Args:
-        transcript_path: Path to conversation transcript
+        transcript: Conversation transcript text
         analysis_type: Type of analysis to perform
         custom_prompt: Custom prompt text (required if analysis_type is 'custom')
         model: Model to use (provider-specific)
+        use_cache: Reuse cached responses for identical (prompt, model) pairs
 
     Returns:
         Analysis text
@@ -146,10 +215,6 @@ def analyze_with_llm(
     # Create provider from environment
     provider = create_provider(default_model=model)
 
-    # Read transcript
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        transcript = f.read()
-
     # Build prompt based on analysis type
     if analysis_type == 'custom':
         if not custom_prompt:
@@ -163,11 +228,10 @@ def analyze_with_llm(
         if not metadata:
             raise ValueError(f"Unknown analysis type: {analysis_type}")
 
-        # Load and render Jinja2 template
+        # Assemble the prompt from the pre-rendered template halves
         try:
-            template_file = metadata['file']
-            template = JINJA_ENV.get_template(template_file)
-            prompt = template.render(transcript=transcript)
+            prefix, suffix = _get_prompt_parts(analysis_type, metadata['file'])
+            prompt = ''.join((prefix, transcript, suffix))
         except TemplateNotFound:
             raise ValueError(f"Template file not found: {metadata['file']}")
 
@@ -177,8 +241,19 @@ def analyze_with_llm(
     provider_name = type(provider).__name__.replace("Provider", "")
     model_name = model or getattr(provider, 'default_model', 'default')
 
+    # The LLM call dominates cost; identical prompt+model pairs (reruns of
+    # the same session/analysis) are served from the on-disk cache instead
+    cache_path = _cached_analysis_path(prompt, model_name)
+    if use_cache:
+        cached = _load_cached_analysis(cache_path)
+        if cached is not None:
+            print(f"⚡ Using cached {analysis_name} result ({cache_path.name})")
+            return cached
+
     print(f"🤖 Running {analysis_name} with {provider_name} ({model_name})...")
-    print(f"📊 Transcript size: {len(transcript):,} characters")
+    # chars/4 is a good-enough order-of-magnitude token estimate; avoids
+    # running a real tokenizer over multi-MB transcripts just for display
+    print(f"📊 Transcript size: {len(transcript):,} characters (~{len(transcript) // 4:,} tokens)")
 
     # Generate analysis
     response = provider.generate(prompt, model=model)
@@ -187,9 +262,104 @@ def analyze_with_llm(
     if response.input_tokens or response.output_tokens:
         print(f"📈 Token usage: {response.input_tokens or 0:,} input, {response.output_tokens or 0:,} output")
 
+    if use_cache:
+        _store_cached_analysis(cache_path, response.text, model_name)
+
     return response.text
 
 
+def get_project_session_ids(project: str, db_path: str) -> List[str]:
+    """
+    Look up all session IDs for a project (by project_id or display name).
+
+    Args:
+        project: Project ID or project name
+        db_path: Path to SQLite database
+
+    Returns:
+        List of session UUIDs (empty if the project is unknown)
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT s.session_id
+        FROM sessions s
+        JOIN projects p ON s.project_id = p.project_id
+        WHERE p.project_id = ? OR p.project_name = ?
+        ORDER BY s.start_time
+    """, (project, project))
+    session_ids = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return session_ids
+
+
+def analyze_project(args) -> None:
+    """
+    Analyze every session in a project concurrently.
+
+    Transcript generation (subprocess-bound) fans out across one worker
+    per CPU; LLM calls (network-bound) are capped at 8 in flight for
+    rate-limit safety. Wall time becomes ~max(session) instead of the sum.
+    """
+    session_ids = get_project_session_ids(args.project, args.db)
+    if not session_ids:
+        print(f"❌ No sessions found for project: {args.project}", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = Path(args.output) if args.output else Path.cwd() / "project_analysis"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"🔍 Analyzing {len(session_ids)} session(s) for project {args.project}...")
+
+    # Phase 1: generate all transcripts in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        transcripts = dict(zip(
+            session_ids,
+            executor.map(
+                lambda sid: get_session_transcript(sid, args.db, save_transcript=args.save_transcript),
+                session_ids
+            )
+        ))
+
+    missing = [sid for sid, transcript in transcripts.items() if not transcript]
+    for sid in missing:
+        print(f"⚠️  Skipping {sid}: no transcript", file=sys.stderr)
+
+    # Phase 2: fan out LLM calls with bounded concurrency
+    failures = 0
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(
+                analyze_with_llm,
+                transcript,
+                args.type,
+                custom_prompt=args.prompt,
+                model=args.model,
+                use_cache=not args.no_cache,
+            ): sid
+            for sid, transcript in transcripts.items() if transcript
+        }
+
+        for future in as_completed(futures):
+            sid = futures[future]
+            try:
+                analysis = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {sid}: {e}", file=sys.stderr)
+                continue
+
+            output_path = output_dir / f"{sid}_{args.type}.md"
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(analysis)
+            print(f"✅ {sid} → {output_path}")
+
+    analyzed = len(futures) - failures
+    print(f"\n✅ Analyzed {analyzed}/{len(session_ids)} session(s); output in {output_dir}")
+    if failures or missing:
+        sys.exit(1)
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -224,13 +394,23 @@ Examples:
         '--model',
         help='Model to use (e.g., "deepseek/deepseek-v3.2", "anthropic/claude-sonnet-4.5"). Defaults to provider default or OPENROUTER_MODEL env var.'
     )
-    parser.add_argument('--project', help='Analyze all sessions for a project (not yet implemented)')
+    parser.add_argument('--project', help='Analyze all sessions for a project (ID or name); outputs one file per session')
     parser.add_argument(
         '--db',
         default=str(Path.home() / 'claude-conversations' / 'conversations.db'),
         help='Path to database (default: ~/claude-conversations/conversations.db)'
     )
     parser.add_argument('--output', help='Output file path (default: stdout)')
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Skip the on-disk response cache and always call the LLM'
+    )
+    parser.add_argument(
+        '--save-transcript',
+        action='store_true',
+        help='Persist freshly generated transcripts to ~/claude-conversations/'
+    )
 
     args = parser.parse_args()
 
@@ -251,31 +431,31 @@ Examples:
         parser.print_help()
         sys.exit(1)
 
-    if args.project:
-        print("❌ Error: Project-level analysis not yet implemented", file=sys.stderr)
-        print("Please specify a single session_id for now.", file=sys.stderr)
-        sys.exit(1)
-
     # Validate custom prompt if needed
     if args.type == 'custom' and not args.prompt:
         print("❌ Error: --prompt is required when using --type=custom", file=sys.stderr)
         sys.exit(1)
 
+    if args.project:
+        analyze_project(args)
+        return
+
     # Get transcript
     print(f"🔍 Looking up session {args.session_id}...")
-    transcript_path = get_session_transcript(args.session_id, args.db)
+    transcript = get_session_transcript(args.session_id, args.db, save_transcript=args.save_transcript)
 
-    if not transcript_path:
+    if not transcript:
         print(f"❌ Could not find or generate transcript for session {args.session_id}", file=sys.stderr)
         sys.exit(1)
 
     # Analyze
     try:
         analysis = analyze_with_llm(
-            transcript_path,
+            transcript,
             args.type,
             custom_prompt=args.prompt,
-            model=args.model
+            model=args.model,
+            use_cache=not args.no_cache
         )
 
         # Output
@@ -87,6 +87,18 @@ CREATE TABLE IF NOT EXISTS tool_uses (
     FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
 );
 
+-- ============================================================================
+-- FILE_SCAN_CACHE TABLE
+-- ============================================================================
+-- Caches per-file message counts keyed on (mtime, size) so the import page
+-- can skip re-scanning unchanged JSONL files when checking for new data
+CREATE TABLE IF NOT EXISTS file_scan_cache (
+    session_id TEXT PRIMARY KEY,        -- UUID from JSONL filename
+    mtime REAL NOT NULL,                -- File modification time at scan
+    size INTEGER NOT NULL,              -- File size in bytes at scan
+    message_count INTEGER NOT NULL      -- Importable messages counted in file
+);
+
 -- ============================================================================
 -- INDEXES
 -- ============================================================================
@@ -101,6 +113,10 @@ CREATE INDEX IF NOT EXISTS idx_sessions_end_time ON sessions(end_time);
 CREATE INDEX IF NOT EXISTS idx_messages_session_id ON messages(session_id);
 CREATE INDEX IF NOT EXISTS idx_messages_role ON messages(role);
 CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp);
+-- Composite index for context-window fetches
+-- (session_id = ? AND message_index BETWEEN ? AND ?): a single B-tree
+-- range scan instead of filtering every message in the session
+CREATE INDEX IF NOT EXISTS idx_messages_session_idx ON messages(session_id, message_index);
 
 -- Tool uses indexes
 CREATE INDEX IF NOT EXISTS idx_tool_uses_session_id ON tool_uses(session_id);
@@ -17,36 +17,82 @@ from claude_code_analytics import config
 
 FTS_SCHEMA = """
 -- ============================================================================
--- FTS5 VIRTUAL TABLES
+-- FTS5 VIRTUAL TABLES (external content)
 -- ============================================================================
+-- content= mode keeps only the inverted index in the FTS tables; column
+-- values are read from the base tables at query time, roughly halving
+-- database size versus duplicating every message and tool result.
 
--- Drop existing tables if they exist
+-- Drop existing tables/triggers if they exist
 DROP TABLE IF EXISTS fts_messages;
 DROP TABLE IF EXISTS fts_tool_uses;
-
--- FTS5 table for message content
+DROP TRIGGER IF EXISTS messages_fts_insert;
+DROP TRIGGER IF EXISTS messages_fts_delete;
+DROP TRIGGER IF EXISTS messages_fts_update;
+DROP TRIGGER IF EXISTS tool_uses_fts_insert;
+DROP TRIGGER IF EXISTS tool_uses_fts_delete;
+DROP TRIGGER IF EXISTS tool_uses_fts_update;
+
+-- FTS5 index over message content (values come from messages)
 CREATE VIRTUAL TABLE fts_messages USING fts5(
     content,                    -- Message text content
     role,                       -- user or assistant
-    project_name,               -- For filtering
     session_id,                 -- For grouping results
     message_id UNINDEXED,       -- Don't index, just store
     timestamp UNINDEXED,        -- Don't index, just store
     message_index UNINDEXED,    -- Don't index, just store
+    content='messages',
+    content_rowid='message_id',
     tokenize = 'porter unicode61'  -- Better tokenization for code
 );
 
--- FTS5 table for tool uses (commands, file paths, results)
+-- FTS5 index over tool uses (values come from tool_uses)
 CREATE VIRTUAL TABLE fts_tool_uses USING fts5(
     tool_name,                  -- Name of the tool
     tool_input,                 -- Input parameters (JSON)
     tool_result,                -- Result content
-    project_name,               -- For filtering
     session_id,                 -- For grouping
     tool_use_id UNINDEXED,      -- Don't index, just store
     timestamp UNINDEXED,        -- Don't index, just store
+    content='tool_uses',
     tokenize = 'porter unicode61'
 );
+
+-- Triggers keep the indexes in sync with the base tables, so imports
+-- no longer require a full FTS rebuild afterwards
+CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO fts_messages(rowid, content, role, session_id, message_id, timestamp, message_index)
+    VALUES (new.message_id, new.content, new.role, new.session_id, new.message_id, new.timestamp, new.message_index);
+END;
+
+CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO fts_messages(fts_messages, rowid, content, role, session_id, message_id, timestamp, message_index)
+    VALUES ('delete', old.message_id, old.content, old.role, old.session_id, old.message_id, old.timestamp, old.message_index);
+END;
+
+CREATE TRIGGER messages_fts_update AFTER UPDATE ON messages BEGIN
+    INSERT INTO fts_messages(fts_messages, rowid, content, role, session_id, message_id, timestamp, message_index)
+    VALUES ('delete', old.message_id, old.content, old.role, old.session_id, old.message_id, old.timestamp, old.message_index);
+    INSERT INTO fts_messages(rowid, content, role, session_id, message_id, timestamp, message_index)
+    VALUES (new.message_id, new.content, new.role, new.session_id, new.message_id, new.timestamp, new.message_index);
+END;
+
+CREATE TRIGGER tool_uses_fts_insert AFTER INSERT ON tool_uses BEGIN
+    INSERT INTO fts_tool_uses(rowid, tool_name, tool_input, tool_result, session_id, tool_use_id, timestamp)
+    VALUES (new.rowid, new.tool_name, new.tool_input, new.tool_result, new.session_id, new.tool_use_id, new.timestamp);
+END;
+
+CREATE TRIGGER tool_uses_fts_delete AFTER DELETE ON tool_uses BEGIN
+    INSERT INTO fts_tool_uses(fts_tool_uses, rowid, tool_name, tool_input, tool_result, session_id, tool_use_id, timestamp)
+    VALUES ('delete', old.rowid, old.tool_name, old.tool_input, old.tool_result, old.session_id, old.tool_use_id, old.timestamp);
+END;
+
+CREATE TRIGGER tool_uses_fts_update AFTER UPDATE ON tool_uses BEGIN
+    INSERT INTO fts_tool_uses(fts_tool_uses, rowid, tool_name, tool_input, tool_result, session_id, tool_use_id, timestamp)
+    VALUES ('delete', old.rowid, old.tool_name, old.tool_input, old.tool_result, old.session_id, old.tool_use_id, old.timestamp);
+    INSERT INTO fts_tool_uses(rowid, tool_name, tool_input, tool_result, session_id, tool_use_id, timestamp)
+    VALUES (new.rowid, new.tool_name, new.tool_input, new.tool_result, new.session_id, new.tool_use_id, new.timestamp);
+END;
 """
 
 
@@ -62,65 +108,50 @@ def create_fts_index(db_path: str):
 
     conn = sqlite3.connect(db_path)
 
+    # Bulk-load pragmas for the one-shot index build: no fsync per WAL
+    # frame, temp structures in memory, a large page cache, and mmap'd
+    # reads for the source tables. synchronous is restored after commit.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-262144")
+    conn.execute("PRAGMA mmap_size=268435456")
+
     try:
         # Create FTS5 tables
         print("1️⃣  Creating FTS5 virtual tables...")
         conn.executescript(FTS_SCHEMA)
         print("   ✅ Created fts_messages and fts_tool_uses tables\n")
 
-        # Populate fts_messages from messages table
+        # Rebuild both indexes from their content tables
         print("2️⃣  Populating fts_messages...")
         cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO fts_messages (
-                rowid, content, role, project_name, session_id,
-                message_id, timestamp, message_index
-            )
-            SELECT
-                m.message_id,
-                m.content,
-                m.role,
-                p.project_name,
-                m.session_id,
-                m.message_id,
-                m.timestamp,
-                m.message_index
-            FROM messages m
-            JOIN sessions s ON m.session_id = s.session_id
-            JOIN projects p ON s.project_id = p.project_id
-            WHERE m.content IS NOT NULL AND LENGTH(m.content) > 0
-        """)
-
-        message_count = cursor.rowcount
+        cursor.execute("INSERT INTO fts_messages(fts_messages) VALUES('rebuild')")
+        cursor.execute("SELECT COUNT(*) FROM messages")
+        message_count = cursor.fetchone()[0]
         print(f"   ✅ Indexed {message_count:,} messages\n")
 
-        # Populate fts_tool_uses from tool_uses table
         print("3️⃣  Populating fts_tool_uses...")
 
-        cursor.execute("""
-            INSERT INTO fts_tool_uses (
-                rowid, tool_name, tool_input, tool_result, project_name,
-                session_id, tool_use_id, timestamp
-            )
-            SELECT
-                t.rowid,
-                t.tool_name,
-                t.tool_input,
-                t.tool_result,
-                p.project_name,
-                t.session_id,
-                t.tool_use_id,
-                t.timestamp
-            FROM tool_uses t
-            JOIN sessions s ON t.session_id = s.session_id
-            JOIN projects p ON s.project_id = p.project_id
-        """)
-
-        tool_count = cursor.rowcount
+        cursor.execute("INSERT INTO fts_tool_uses(fts_tool_uses) VALUES('rebuild')")
+        cursor.execute("SELECT COUNT(*) FROM tool_uses")
+        tool_count = cursor.fetchone()[0]
         print(f"   ✅ Indexed {tool_count:,} tool uses\n")
 
+        # Both INSERT ... SELECT statements ride in the same implicit
+        # transaction (sqlite3 auto-begins on the first INSERT), so this
+        # is a single commit for the whole load
+        conn.commit()
+
+        # Merge FTS5 b-tree segments so subsequent MATCH queries touch
+        # fewer pages, then put durability back to normal
+        print("4️⃣  Optimizing FTS5 segments...")
+        cursor.execute("INSERT INTO fts_messages(fts_messages) VALUES('optimize')")
+        cursor.execute("INSERT INTO fts_tool_uses(fts_tool_uses) VALUES('optimize')")
         conn.commit()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        print("   ✅ Segments merged\n")
 
         # Show statistics
         print("📊 FTS5 Index Statistics:")
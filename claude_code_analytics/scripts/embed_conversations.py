@@ -8,137 +8,285 @@ This script:
 3. Stores in ChromaDB with metadata for filtering
 """
 
+import argparse
+import hashlib
+import itertools
+import os
 import sqlite3
 import chromadb
+from chromadb.config import Settings
+import numpy as np
+import pandas as pd
+import torch
 from sentence_transformers import SentenceTransformer
 from pathlib import Path
 import sys
-from typing import List, Dict
+from typing import Dict, Iterator
 from datetime import datetime
 
+# Overridable for speed/size tradeoffs (e.g. all-MiniLM-L6-v2 encodes
+# 2-3x faster with 384-dim vectors); the default matches existing
+# indexes so search stays compatible without a re-embed
+MODEL_NAME = os.environ.get('CLAUDE_EMBED_MODEL', 'all-mpnet-base-v2')
+
+MESSAGE_QUERY = """
+SELECT
+    m.message_id,
+    m.session_id,
+    m.message_index,
+    m.role,
+    m.content,
+    CASE
+        WHEN LENGTH(m.content) <= 100 THEN m.content
+        ELSE substr(m.content, 1, 100) || '...'
+    END as preview,
+    m.timestamp,
+    s.project_id,
+    p.project_name,
+    s.start_time as session_start,
+    s.message_count as session_message_count
+FROM messages m
+JOIN sessions s ON m.session_id = s.session_id
+JOIN projects p ON s.project_id = p.project_id
+WHERE m.content IS NOT NULL AND LENGTH(m.content) > 0
+ORDER BY m.timestamp
+"""
+
 
-def get_all_messages(db_path: str) -> List[Dict]:
+def open_embedding_cache(db_path: str) -> sqlite3.Connection:
     """
-    Fetch all messages from SQLite with relevant metadata.
+    Open the persistent embedding cache, creating the table if needed.
 
-    Returns:
-        List of dicts with message content and metadata
+    Vectors are keyed on (content hash, model) and stored as float16
+    bytes - half the storage at no retrieval-quality cost - so re-runs
+    only pay encode time for messages whose content actually changed.
     """
     conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Return rows as dicts
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            content_sha TEXT NOT NULL,
+            model TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            PRIMARY KEY (content_sha, model)
+        )
+    """)
+    conn.commit()
+    return conn
 
-    cursor = conn.cursor()
-
-    query = """
-    SELECT
-        m.message_id,
-        m.session_id,
-        m.message_index,
-        m.role,
-        m.content,
-        m.timestamp,
-        s.project_id,
-        p.project_name,
-        s.start_time as session_start,
-        s.message_count as session_message_count
-    FROM messages m
-    JOIN sessions s ON m.session_id = s.session_id
-    JOIN projects p ON s.project_id = p.project_id
-    WHERE m.content IS NOT NULL AND LENGTH(m.content) > 0
-    ORDER BY m.timestamp
-    """
 
-    cursor.execute(query)
-    messages = [dict(row) for row in cursor.fetchall()]
+def count_messages(db_path: str) -> int:
+    """Count the messages that will be embedded."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM messages WHERE content IS NOT NULL AND LENGTH(content) > 0"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
 
-    conn.close()
+def iter_all_messages(db_path: str) -> Iterator[Dict]:
+    """
+    Stream messages from SQLite with relevant metadata.
 
-    return messages
+    Yields rows one at a time instead of materializing the whole JOIN
+    with fetchall(), keeping memory flat no matter the corpus size. The
+    pragmas let SQLite serve the scan from mmap'd pages.
 
+    Yields:
+        Dicts with message content and metadata
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row  # Return rows as dicts
+    conn.execute("PRAGMA mmap_size=1073741824")
+    conn.execute("PRAGMA cache_size=-131072")
 
-def create_preview(content: str, max_length: int = 100) -> str:
-    """Create a preview of message content."""
-    if len(content) <= max_length:
-        return content
-    return content[:max_length] + "..."
+    try:
+        cursor = conn.cursor()
+        cursor.execute(MESSAGE_QUERY)
+        for row in cursor:
+            yield dict(row)
+    finally:
+        conn.close()
 
 
-def embed_conversations(db_path: str, chroma_path: str, batch_size: int = 100):
+def get_message_stats(db_path: str) -> tuple:
+    """
+    Aggregate role and project message counts in SQL.
+
+    Returns:
+        Tuple of (role counts dict, project counts dict)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        roles = dict(conn.execute("""
+            SELECT role, COUNT(*) FROM messages
+            WHERE content IS NOT NULL AND LENGTH(content) > 0
+            GROUP BY role
+        """).fetchall())
+        projects = dict(conn.execute("""
+            SELECT p.project_name, COUNT(*)
+            FROM messages m
+            JOIN sessions s ON m.session_id = s.session_id
+            JOIN projects p ON s.project_id = p.project_id
+            WHERE m.content IS NOT NULL AND LENGTH(m.content) > 0
+            GROUP BY p.project_name
+        """).fetchall())
+        return roles, projects
+    finally:
+        conn.close()
+
+
+def embed_conversations(db_path: str, chroma_path: str, batch_size: int = 1024):
     """
     Main embedding process.
 
     Args:
         db_path: Path to SQLite database
         chroma_path: Path to ChromaDB storage directory
-        batch_size: Number of messages to embed at once
+        batch_size: Messages pulled, encoded and upserted per chunk
     """
     print("🚀 Starting conversation embedding process...")
     print(f"📊 Database: {db_path}")
     print(f"💾 ChromaDB: {chroma_path}\n")
 
-    # Load messages from SQLite
-    print("1️⃣  Loading messages from database...")
-    messages = get_all_messages(db_path)
-    print(f"   Found {len(messages):,} messages to embed\n")
+    # Count messages up front (cheap); the rows themselves are streamed
+    print("1️⃣  Counting messages in database...")
+    total = count_messages(db_path)
+    print(f"   Found {total:,} messages to embed\n")
 
-    if not messages:
+    if not total:
         print("❌ No messages found in database!")
         return
 
-    # Initialize ChromaDB
+    # Initialize ChromaDB. The collection is kept across runs (upsert
+    # below replaces rows by id), so incremental re-embeds don't start
+    # from an empty index.
     print("2️⃣  Initializing ChromaDB...")
-    client = chromadb.PersistentClient(path=chroma_path)
-
-    # Delete existing collection if it exists (for fresh start)
-    try:
-        client.delete_collection("conversations")
-        print("   Deleted existing collection")
-    except:
-        pass
+    client = chromadb.PersistentClient(
+        path=chroma_path,
+        settings=Settings(anonymized_telemetry=False),
+    )
 
-    collection = client.create_collection(
+    collection = client.get_or_create_collection(
         name="conversations",
-        metadata={"description": "Claude Code conversation history"}
+        metadata={
+            "description": "Claude Code conversation history",
+            "embedding_model": MODEL_NAME,
+            # Vectors are normalized at encode time, so cosine distance
+            # is exact and search gets calibrated 1 - cos scores
+            "hnsw:space": "cosine",
+        }
     )
-    print(f"   Created collection: conversations\n")
 
-    # Load embedding model
-    print("3️⃣  Loading embedding model (all-mpnet-base-v2)...")
-    model = SentenceTransformer('all-mpnet-base-v2')
+    # Refuse to mix embedding spaces: vectors from different models are
+    # not comparable, and search would silently degrade
+    indexed_model = (collection.metadata or {}).get("embedding_model")
+    if indexed_model and indexed_model != MODEL_NAME:
+        print(f"❌ Collection was embedded with '{indexed_model}', but "
+              f"CLAUDE_EMBED_MODEL is '{MODEL_NAME}'.")
+        print("   Delete the collection (or unset CLAUDE_EMBED_MODEL) to re-embed.")
+        sys.exit(1)
+
+    print(f"   Collection: conversations ({collection.count():,} existing entries)\n")
+
+    # Load embedding model on the fastest available device; fp16 on GPU
+    # roughly doubles encode throughput at no quality cost here
+    device = (
+        'cuda' if torch.cuda.is_available()
+        else 'mps' if torch.backends.mps.is_available()
+        else 'cpu'
+    )
+    print(f"3️⃣  Loading embedding model ({MODEL_NAME}, device={device})...")
+    model = SentenceTransformer(MODEL_NAME, device=device)
+    if device == 'cuda':
+        model.half()
     print(f"   Model loaded: {model.get_sentence_embedding_dimension()} dimensions\n")
 
-    # Process messages in batches
+    # Stream rows from SQLite in chunks: each chunk is encoded (internal
+    # length-sorted batching keeps the device saturated) and flushed to
+    # ChromaDB before the next is pulled, so memory stays flat no matter
+    # the corpus size. Normalized vectors make cosine a dot product.
     print("4️⃣  Generating embeddings and storing in ChromaDB...")
-    total = len(messages)
-
-    for i in range(0, total, batch_size):
-        batch = messages[i:i + batch_size]
-        batch_end = min(i + batch_size, total)
-
-        # Prepare data for this batch
-        documents = [msg['content'] for msg in batch]
-        ids = [f"msg_{msg['message_id']}" for msg in batch]
-        metadatas = [
-            {
-                "message_id": str(msg['message_id']),
-                "session_id": msg['session_id'],
-                "project_id": msg['project_id'],
-                "project_name": msg['project_name'],
-                "role": msg['role'],
-                "timestamp": msg['timestamp'] or "",
-                "message_index": msg['message_index'],
-                "preview": create_preview(msg['content']),
-                "session_start": msg['session_start'] or "",
-                "session_message_count": msg['session_message_count']
-            }
-            for msg in batch
-        ]
-
-        # Generate embeddings for this batch
-        embeddings = model.encode(documents, show_progress_bar=False).tolist()
-
-        # Add to ChromaDB
-        collection.add(
+    cache_conn = open_embedding_cache(db_path)
+    message_iter = iter_all_messages(db_path)
+    encode_chunk = batch_size
+
+    batch_end = 0
+    encoded_new = 0
+    flat_ids = []
+    flat_chunks = []
+
+    while True:
+        batch = list(itertools.islice(message_iter, encode_chunk))
+        if not batch:
+            break
+        batch_end += len(batch)
+
+        # Prepare data for this batch with vectorized pandas string ops
+        # instead of per-row Python calls
+        df = pd.DataFrame(batch)
+        message_ids = df['message_id'].astype(str)
+        documents = df['content'].tolist()
+        ids = ('msg_' + message_ids).tolist()
+        metadatas = pd.DataFrame({
+            "message_id": message_ids,
+            "session_id": df['session_id'],
+            "project_id": df['project_id'],
+            "project_name": df['project_name'],
+            "role": df['role'],
+            "timestamp": df['timestamp'].fillna(""),
+            # plain ints, not numpy scalars - Chroma serializes metadata
+            # with a strict JSON encoder that rejects np.int64
+            "message_index": df['message_index'].map(int),
+            "preview": df['preview'],
+            "session_start": df['session_start'].fillna(""),
+            "session_message_count": df['session_message_count'].map(int),
+        }).to_dict('records')
+
+        # Only encode messages whose content hash isn't cached yet;
+        # unchanged rows cost one dict lookup instead of a model pass
+        hashes = [hashlib.sha256(doc.encode('utf-8')).hexdigest() for doc in documents]
+        unique_hashes = list(set(hashes))
+        placeholders = ','.join('?' * len(unique_hashes))
+        vector_by_sha = dict(cache_conn.execute(
+            f"SELECT content_sha, vector FROM embedding_cache "
+            f"WHERE model = ? AND content_sha IN ({placeholders})",
+            [MODEL_NAME, *unique_hashes]
+        ))
+
+        miss_indices = [i for i, sha in enumerate(hashes) if sha not in vector_by_sha]
+        if miss_indices:
+            new_embeddings = model.encode(
+                [documents[i] for i in miss_indices],
+                # device micro-batch; capped so small --batch-size values
+                # behave as documented
+                batch_size=min(batch_size, 128),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            for i, vector in zip(miss_indices, new_embeddings):
+                vector_by_sha[hashes[i]] = np.asarray(vector, dtype=np.float16).tobytes()
+            cache_conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (content_sha, model, vector) VALUES (?, ?, ?)",
+                [(hashes[i], MODEL_NAME, vector_by_sha[hashes[i]]) for i in miss_indices]
+            )
+            cache_conn.commit()
+            encoded_new += len(miss_indices)
+
+        chunk_vectors = np.array([
+            np.frombuffer(vector_by_sha[sha], dtype=np.float16) for sha in hashes
+        ])
+        embeddings = chunk_vectors.astype(np.float32).tolist()
+
+        # Accumulate the flat-index snapshot (fp16, ~1.5KB/message) used
+        # by search_conversations --backend=flat
+        flat_ids.extend(message_ids.tolist())
+        flat_chunks.append(chunk_vectors)
+
+        # Upsert so re-runs replace rows in place
+        collection.upsert(
             documents=documents,
             embeddings=embeddings,
             metadatas=metadatas,
@@ -149,17 +297,28 @@ def embed_conversations(db_path: str, chroma_path: str, batch_size: int = 100):
         progress = (batch_end / total) * 100
         print(f"   Progress: {batch_end:,}/{total:,} ({progress:.1f}%)")
 
+    cache_conn.close()
+
+    # Write the flat snapshot alongside the database: a dense matrix of
+    # all vectors in message order, for exact dot-product search without
+    # HNSW or document-storage overhead at realistic corpus sizes
+    if flat_chunks:
+        flat_path = Path(db_path).parent / "flat_index.npz"
+        np.savez(
+            flat_path,
+            model=np.array(MODEL_NAME),
+            ids=np.array(flat_ids),
+            vectors=np.concatenate(flat_chunks),
+        )
+        print(f"\n   Flat index written: {flat_path}")
+
     print(f"\n✅ Embedding complete!")
-    print(f"   Total messages embedded: {total:,}")
+    print(f"   Total messages embedded: {batch_end:,} ({encoded_new:,} newly encoded, rest from cache)")
     print(f"   Collection size: {collection.count():,}")
 
-    # Show some stats
+    # Show some stats (aggregated in SQL, not a Python pass over rows)
     print("\n📊 Statistics:")
-    roles = {}
-    projects = {}
-    for msg in messages:
-        roles[msg['role']] = roles.get(msg['role'], 0) + 1
-        projects[msg['project_name']] = projects.get(msg['project_name'], 0) + 1
+    roles, projects = get_message_stats(db_path)
 
     print(f"   By role:")
     for role, count in sorted(roles.items()):
@@ -172,6 +331,15 @@ def embed_conversations(db_path: str, chroma_path: str, batch_size: int = 100):
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Embed conversation messages into ChromaDB')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1024,
+        help='Messages per encode/insert chunk (default: 1024; lower to cap memory use)'
+    )
+    args = parser.parse_args()
+
     # Default paths
     home = Path.home()
     db_path = home / "claude-conversations" / "conversations.db"
@@ -185,7 +353,7 @@ def main():
 
     # Run embedding process
     try:
-        embed_conversations(str(db_path), str(chroma_path))
+        embed_conversations(str(db_path), str(chroma_path), batch_size=args.batch_size)
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(1)
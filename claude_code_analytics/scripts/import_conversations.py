@@ -20,6 +20,16 @@ import logging
 
 from claude_code_analytics import config
 
+# orjson parses JSONL lines 2-5x faster than stdlib json; fall back to the
+# stdlib when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(line):
+        return orjson.loads(line)
+except ImportError:
+    _json_loads = json.loads
+
 
 # Configure logging
 logging.basicConfig(
@@ -149,9 +159,9 @@ def parse_jsonl_file(file_path: Path) -> List[Dict]:
                 if not line:
                     continue
                 try:
-                    entry = json.loads(line)
+                    entry = _json_loads(line)
                     entries.append(entry)
-                except json.JSONDecodeError as e:
+                except ValueError as e:  # both json and orjson decode errors
                     logger.warning(f"  ⚠️  Skipping invalid JSON on line {line_num}: {e}")
                     continue
     except Exception as e:
@@ -164,7 +174,8 @@ def parse_jsonl_file(file_path: Path) -> List[Dict]:
 def process_session(
     session_file: Path,
     project_id: str,
-    conn: sqlite3.Connection
+    conn: sqlite3.Connection,
+    entries: Optional[List[Dict]] = None
 ) -> Tuple[int, int]:
     """
     Process a single session JSONL file and import into database.
@@ -174,6 +185,7 @@ def process_session(
         session_file: Path to session JSONL file
         project_id: Project ID this session belongs to
         conn: Database connection
+        entries: Pre-parsed JSONL entries (parsed from session_file if None)
 
     Returns:
         Tuple of (message_count, tool_use_count)
@@ -195,8 +207,9 @@ def process_session(
     is_incremental = max_message_index >= 0
     skip_until_index = max_message_index  # Import messages after this index
 
-    # Parse JSONL file
-    entries = parse_jsonl_file(session_file)
+    # Parse JSONL file (unless pre-parsed entries were handed in)
+    if entries is None:
+        entries = parse_jsonl_file(session_file)
     if not entries:
         logger.warning(f"    ⚠️  No entries found in {session_file.name}")
         return (0, 0)
@@ -355,7 +368,8 @@ def process_session(
 
 def import_project(
     project_dir: Path,
-    conn: sqlite3.Connection
+    conn: sqlite3.Connection,
+    parsed_sessions: Optional[Dict[Path, List[Dict]]] = None
 ) -> Tuple[int, int, int]:
     """
     Import all sessions from a project directory.
@@ -363,6 +377,8 @@ def import_project(
     Args:
         project_dir: Path to project directory
         conn: Database connection
+        parsed_sessions: Optional map of session file -> pre-parsed entries,
+            used by callers that parse JSONL in worker threads
 
     Returns:
         Tuple of (session_count, message_count, tool_use_count)
@@ -396,7 +412,8 @@ def import_project(
     for session_file in jsonl_files:
         logger.info(f"  📄 Importing session: {session_file.name}")
         try:
-            msg_count, tool_count = process_session(session_file, project_id, conn)
+            entries = parsed_sessions.get(session_file) if parsed_sessions else None
+            msg_count, tool_count = process_session(session_file, project_id, conn, entries=entries)
             if msg_count > 0:
                 total_sessions += 1
                 total_messages += msg_count
@@ -441,6 +458,13 @@ def main():
     conn = sqlite3.connect(str(db_path))
     conn.execute("PRAGMA foreign_keys = ON")
 
+    # Schema upkeep for databases created before this index existed:
+    # context-window fetches need a (session_id, message_index) range scan
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_session_idx "
+        "ON messages(session_id, message_index)"
+    )
+
     # Set secure permissions on database file
     import os
     os.chmod(str(db_path), 0o600)
@@ -487,6 +511,10 @@ def main():
         # Final commit
         conn.commit()
 
+        # Refresh planner statistics so queries pick the right indexes
+        # over the freshly bulk-loaded tables
+        conn.execute("ANALYZE")
+
         # Print summary
         logger.info("\n" + "="*60)
         logger.info("✅ Import complete!")
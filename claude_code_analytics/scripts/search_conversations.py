@@ -12,26 +12,343 @@ Examples:
 """
 
 import argparse
+import functools
+import hashlib
+import os
+from collections import namedtuple
 import chromadb
+import numpy as np
 import sqlite3
 from sentence_transformers import SentenceTransformer
 from pathlib import Path
 import sys
 from typing import List, Dict, Optional
-from datetime import datetime
 
+# Must match the model the collection was embedded with (see
+# embed_conversations.py); checked against collection metadata below
+MODEL_NAME = os.environ.get('CLAUDE_EMBED_MODEL', 'all-mpnet-base-v2')
 
+# Persistent query-embedding cache: repeat searches skip both the ~1.5s
+# model load and the encode, leaving just the ChromaDB query
+QUERY_CACHE_DIR = Path.home() / "claude-conversations" / "query_cache"
+
+# Unix socket for the optional resident embedding daemon (--daemon):
+# keeps the model warm so novel queries skip the cold start too
+DAEMON_SOCKET = Path.home() / "claude-conversations" / "embed_daemon.sock"
+
+# Dense vector snapshot written by embed_conversations.py, used by the
+# exact-search flat backend (--backend=flat)
+FLAT_INDEX_PATH = Path.home() / "claude-conversations" / "flat_index.npz"
+
+# Context rows as namedtuples: field order matches the SELECT below, and
+# attribute access is a C-level slot read instead of a dict per row
+ContextMsg = namedtuple(
+    "ContextMsg",
+    "session_id message_index role content content_length timestamp"
+)
+
+
+def _query_cache_path(query: str, model_name: str = MODEL_NAME) -> Path:
+    key = hashlib.sha256(f"{model_name}\x00{query}".encode('utf-8')).hexdigest()
+    return QUERY_CACHE_DIR / f"{key}.vec"
+
+
+def load_cached_query_embedding(query: str) -> Optional[List[float]]:
+    """Return the cached embedding for a query, or None on miss."""
+    path = _query_cache_path(query)
+    if not path.exists():
+        return None
+    try:
+        return np.frombuffer(path.read_bytes(), dtype=np.float32).tolist()
+    except OSError:
+        return None
+
+
+def store_cached_query_embedding(query: str, embedding: np.ndarray) -> None:
+    """Persist a query embedding as raw float32 bytes (~3KB/entry)."""
+    QUERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _query_cache_path(query).write_bytes(
+        np.asarray(embedding, dtype=np.float32).tobytes()
+    )
+
+
+def run_embedding_daemon():
+    """
+    Keep the embedding model resident and serve encodes over a socket.
+
+    One-shot CLI runs pay ~1.5s of torch import + weight load before the
+    first encode. Running `search_conversations.py --daemon` in a spare
+    terminal loads the model once; subsequent searches find the socket
+    and get their query embedding in milliseconds instead.
+    """
+    from multiprocessing.connection import Listener
+
+    DAEMON_SOCKET.parent.mkdir(parents=True, exist_ok=True)
+    if DAEMON_SOCKET.exists():
+        DAEMON_SOCKET.unlink()
+
+    print(f"📥 Loading embedding model ({MODEL_NAME})...")
+    model = SentenceTransformer(MODEL_NAME)
+
+    try:
+        with Listener(str(DAEMON_SOCKET), family='AF_UNIX') as listener:
+            print(f"🟢 Embedding daemon ready on {DAEMON_SOCKET} (Ctrl+C to stop)")
+            while True:
+                with listener.accept() as client:
+                    try:
+                        model_name, query = client.recv()
+                        if model_name != MODEL_NAME:
+                            # Client wants a different model; make it
+                            # fall back to a local load
+                            client.send(None)
+                            continue
+                        encoded = model.encode(
+                            query, show_progress_bar=False, convert_to_numpy=True
+                        )
+                        client.send(np.asarray(encoded, dtype=np.float32))
+                    except EOFError:
+                        continue
+    finally:
+        if DAEMON_SOCKET.exists():
+            DAEMON_SOCKET.unlink()
+
+
+def encode_query_via_daemon(query: str) -> Optional[np.ndarray]:
+    """
+    Ask the resident daemon for a query embedding.
+
+    Returns None when no daemon is running (or the socket is stale or
+    serves a different model), in which case the caller loads the model
+    locally as before.
+    """
+    from multiprocessing.connection import Client
+
+    if not DAEMON_SOCKET.exists():
+        return None
+    try:
+        with Client(str(DAEMON_SOCKET), family='AF_UNIX') as conn:
+            conn.send((MODEL_NAME, query))
+            encoded = conn.recv()
+    except (OSError, EOFError):
+        return None
+    if encoded is None:
+        return None
+    return np.asarray(encoded, dtype=np.float32)
+
+
+def get_query_embedding(query: str) -> np.ndarray:
+    """
+    Resolve a query embedding: disk cache, then daemon, then local model.
+
+    Only the last resort pays the model load; the result is always
+    persisted to the on-disk cache for next time.
+    """
+    cached = load_cached_query_embedding(query)
+    if cached is not None:
+        return np.asarray(cached, dtype=np.float32)
+
+    encoded = encode_query_via_daemon(query)
+    if encoded is None:
+        print("📥 Loading embedding model...")
+        model = SentenceTransformer(MODEL_NAME)
+        encoded = model.encode(query, show_progress_bar=False, convert_to_numpy=True)
+    store_cached_query_embedding(query, encoded)
+    return np.asarray(encoded, dtype=np.float32)
+
+
+def search_flat(
+    query: str,
+    conn: sqlite3.Connection,
+    limit: int = 10,
+    project: Optional[str] = None,
+    role: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    context_size: int = 2,
+    show_json: bool = False,
+    ndjson: bool = False
+):
+    """
+    Exact inner-product search over the flat vector snapshot.
+
+    At single-user corpus sizes (well under ~100k messages) one
+    BLAS-backed matrix-vector product over the memory-friendly dense
+    matrix beats HNSW graph traversal plus ChromaDB's per-query document
+    storage cost, and the scores are exact rather than approximate.
+    Metadata and filters come from SQLite via the existing connection.
+    """
+    if not FLAT_INDEX_PATH.exists():
+        print(f"❌ Flat index not found: {FLAT_INDEX_PATH}")
+        print("   Re-run embed_conversations.py to write it, or use --backend=chroma.")
+        sys.exit(1)
+
+    snapshot = np.load(FLAT_INDEX_PATH, allow_pickle=False)
+    indexed_model = str(snapshot['model'])
+    if indexed_model != MODEL_NAME:
+        print(f"❌ Flat index was embedded with '{indexed_model}', but "
+              f"CLAUDE_EMBED_MODEL is '{MODEL_NAME}'.")
+        sys.exit(1)
+
+    ids = snapshot['ids']
+    vectors = snapshot['vectors'].astype(np.float32)
+
+    # Stored vectors are L2-normalized at encode time, so after
+    # normalizing the query a dot product is exact cosine similarity
+    query_embedding = get_query_embedding(query)
+    norm = np.linalg.norm(query_embedding)
+    q = query_embedding / norm if norm else query_embedding
+
+    print(f"🔍 Searching for: \"{query}\" (flat backend, {len(ids):,} vectors)")
+
+    scores = vectors @ q
+
+    # Overfetch candidates so post-filters don't starve the result list,
+    # then rank just the candidate slice
+    n_candidates = min(len(scores), max(limit * 10, limit))
+    top = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+    top = top[np.argsort(-scores[top])]
+
+    candidate_ids = [int(ids[i]) for i in top]
+    placeholders = ','.join('?' * len(candidate_ids))
+    rows = conn.execute(f"""
+        SELECT m.message_id, m.session_id, m.message_index, m.role,
+               m.content, m.timestamp, p.project_name
+        FROM messages m
+        JOIN sessions s ON m.session_id = s.session_id
+        JOIN projects p ON s.project_id = p.project_id
+        WHERE m.message_id IN ({placeholders})
+    """, candidate_ids).fetchall()
+    rows_by_id = {row[0]: row for row in rows}
+
+    formatted_results = []
+    for rank, i in enumerate(top):
+        row = rows_by_id.get(candidate_ids[rank])
+        if row is None:
+            continue
+        message_id, session_id, message_index, msg_role, content, timestamp, project_name = row
+
+        if project and project.lower() not in (project_name or '').lower():
+            continue
+        if role and msg_role != role:
+            continue
+        if after and (timestamp or '') < after:
+            continue
+        if before and (timestamp or '') > before:
+            continue
+
+        formatted_results.append({
+            'id': f"msg_{message_id}",
+            'document': content,
+            'metadata': {
+                'message_id': str(message_id),
+                'session_id': session_id,
+                'message_index': int(message_index),
+                'role': msg_role,
+                'timestamp': timestamp or '',
+                'project_name': project_name,
+            },
+            'score': float(scores[i]),
+        })
+        if len(formatted_results) >= limit:
+            break
+
+    if not formatted_results:
+        print("\n❌ No results found")
+        return
+
+    display_results(formatted_results, conn, context_size, show_json, ndjson)
+
+
+def get_message_contexts_batch(
+    conn: sqlite3.Connection,
+    pairs: List[tuple],
+    context_size: int = 2,
+    preview_len: int = 100
+) -> Dict[tuple, Dict]:
+    """
+    Fetch surrounding context for several messages in one query.
+
+    One OR-of-BETWEEN query on the shared connection instead of a
+    connect/query/close round-trip per result. Context rows are only
+    ever shown as previews (the matched message's full text comes from
+    ChromaDB), so content is truncated with substr() in SQL - long tool
+    outputs never cross the SQLite boundary. Each row carries
+    content_length so callers can tell whether truncation happened.
+
+    Args:
+        conn: Open connection to the SQLite database
+        pairs: List of (session_id, message_index) tuples
+        context_size: Number of messages before/after to fetch
+        preview_len: Characters of content to fetch per context row
+
+    Returns:
+        Dict mapping each pair to {previous, current, next} messages
+    """
+    contexts = {
+        pair: {"previous": [], "current": None, "next": []}
+        for pair in pairs
+    }
+    if not pairs or context_size < 0:
+        return contexts
+
+    where_clause = " OR ".join(
+        "(session_id = ? AND message_index BETWEEN ? AND ?)" for _ in pairs
+    )
+    # Fetch one char beyond the preview so content_length alone decides
+    # whether an ellipsis is needed
+    params = [preview_len + 1]
+    for session_id, message_index in pairs:
+        params.extend((session_id, max(0, message_index - context_size), message_index + context_size))
+
+    cursor = conn.execute(f"""
+        SELECT session_id, message_index, role,
+               substr(content, 1, ?) AS content,
+               LENGTH(content) AS content_length,
+               timestamp
+        FROM messages
+        WHERE {where_clause}
+        ORDER BY session_id, message_index
+    """, params)
+    rows = [ContextMsg(*row) for row in cursor.fetchall()]
+
+    # Bucket-sort rows into each requested window (a row can fall into
+    # several windows when matches from one session are close together)
+    rows_by_session = {}
+    for row in rows:
+        rows_by_session.setdefault(row.session_id, []).append(row)
+
+    for session_id, message_index in pairs:
+        context = contexts[(session_id, message_index)]
+        for msg in rows_by_session.get(session_id, []):
+            if abs(msg.message_index - message_index) > context_size:
+                continue
+            if msg.message_index < message_index:
+                context['previous'].append(msg)
+            elif msg.message_index == message_index:
+                context['current'] = msg
+            else:
+                context['next'].append(msg)
+
+    return contexts
+
+
+@functools.lru_cache(maxsize=256)
 def get_message_context(
-    db_path: str,
+    conn: sqlite3.Connection,
     session_id: str,
     message_index: int,
     context_size: int = 2
 ) -> Dict:
     """
-    Fetch surrounding context for a message.
+    Fetch surrounding context for a single message.
+
+    Thin wrapper over get_message_contexts_batch for one-shot callers,
+    memoized so repeated lookups of the same window (hits clustered in
+    one session) reuse the first fetch. The batched display path already
+    coalesces its windows into a single query and bypasses this cache.
 
     Args:
-        db_path: Path to SQLite database
+        conn: Open connection to the SQLite database
         session_id: Session ID
         message_index: Index of the matched message
         context_size: Number of messages before/after to fetch
@@ -39,147 +356,133 @@ def get_message_context(
     Returns:
         Dict with previous, current, and next messages
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
-    # Get surrounding messages
-    query = """
-    SELECT message_index, role, content, timestamp
-    FROM messages
-    WHERE session_id = ?
-      AND message_index BETWEEN ? AND ?
-    ORDER BY message_index
-    """
-
-    start_idx = max(0, message_index - context_size)
-    end_idx = message_index + context_size
-
-    cursor = conn.cursor()
-    cursor.execute(query, (session_id, start_idx, end_idx))
-
-    messages = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-
-    # Organize into previous, current, next
-    result = {
-        "previous": [],
-        "current": None,
-        "next": []
-    }
-
-    for msg in messages:
-        if msg['message_index'] < message_index:
-            result['previous'].append(msg)
-        elif msg['message_index'] == message_index:
-            result['current'] = msg
-        else:
-            result['next'].append(msg)
-
-    return result
+    pair = (session_id, message_index)
+    return get_message_contexts_batch(conn, [pair], context_size)[pair]
 
 
 def format_timestamp(ts: Optional[str]) -> str:
     """Format timestamp for display."""
     if not ts:
         return "Unknown time"
-    try:
-        dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-        return dt.strftime("%Y-%m-%d %H:%M")
-    except:
-        return ts
-
-
-def display_results(results: List[Dict], db_path: str, context_size: int, show_json: bool):
+    # Stored timestamps are ISO-8601, so slicing produces the
+    # "%Y-%m-%d %H:%M" display directly - no parse/re-format round trip
+    # for a function called once per displayed message
+    if len(ts) >= 16 and ts[4] == '-' and ts[10] in ('T', ' '):
+        return ts[:10] + " " + ts[11:16]
+    return ts
+
+
+def display_results(
+    results: List[Dict],
+    conn: sqlite3.Connection,
+    context_size: int,
+    show_json: bool,
+    ndjson: bool = False
+):
     """
     Display search results in a readable format.
 
     Args:
         results: List of search results from ChromaDB
-        db_path: Path to SQLite for fetching context
+        conn: Open SQLite connection for fetching context
         context_size: Number of context messages to show
-        show_json: Output as JSON instead
+        show_json: Output as a JSON array instead
+        ndjson: Output as newline-delimited JSON, one object per line
     """
-    if show_json:
+    if show_json or ndjson:
+        # Stream each result as it is serialized instead of building the
+        # whole array in memory first - constant memory regardless of
+        # --limit, and NDJSON consumers (jq, head) can stop early
         import json
-        output = []
-        for result in results:
-            output.append({
+        for i, result in enumerate(results):
+            obj = json.dumps({
                 "score": result['score'],
                 "message": result['document'],
                 "metadata": result['metadata']
-            })
-        print(json.dumps(output, indent=2))
+            }, separators=(',', ':') if ndjson else None, indent=None if ndjson else 2)
+            if ndjson:
+                sys.stdout.write(obj + "\n")
+            else:
+                sys.stdout.write("[\n" if i == 0 else ",\n")
+                sys.stdout.write(obj)
+        if not ndjson:
+            sys.stdout.write("[]" if not results else "\n]")
+            sys.stdout.write("\n")
         return
 
     # Human-readable output
-    print(f"\n{'='*80}")
-    print(f"Found {len(results)} result(s)")
-    print(f"{'='*80}\n")
+    sys.stdout.write(f"\n{'='*80}\nFound {len(results)} result(s)\n{'='*80}\n\n")
+
+    # Fetch all contexts up front in a single query
+    contexts = {}
+    if context_size > 0:
+        pairs = [
+            (r['metadata']['session_id'], int(r['metadata']['message_index']))
+            for r in results
+        ]
+        contexts = get_message_contexts_batch(conn, pairs, context_size)
 
     for idx, result in enumerate(results, 1):
         meta = result['metadata']
         score = result['score']
 
-        # Header
-        print(f"[{idx}] Score: {score:.4f}")
-        print(f"    Project: {meta['project_name']}")
-        print(f"    Session: {meta['session_id']}")
-        print(f"    Time: {format_timestamp(meta.get('timestamp'))}")
-        print(f"    Role: {meta['role']}")
-        print()
+        # Assemble each result block in memory and flush it with one
+        # write - dozens of line-buffered print() calls per result
+        # otherwise mean dozens of write syscalls
+        parts = [
+            f"[{idx}] Score: {score:.4f}\n"
+            f"    Project: {meta['project_name']}\n"
+            f"    Session: {meta['session_id']}\n"
+            f"    Time: {format_timestamp(meta.get('timestamp'))}\n"
+            f"    Role: {meta['role']}\n\n"
+        ]
 
         # Get context if requested
         if context_size > 0:
-            context = get_message_context(
-                db_path,
-                meta['session_id'],
-                int(meta['message_index']),
-                context_size
-            )
+            context = contexts[(meta['session_id'], int(meta['message_index']))]
 
             # Show previous messages
             if context['previous']:
-                print("    Context (before):")
+                parts.append("    Context (before):\n")
                 for msg in context['previous']:
-                    role_symbol = "👤" if msg['role'] == 'user' else "🤖"
-                    preview = msg['content'][:100] + ("..." if len(msg['content']) > 100 else "")
-                    print(f"      {role_symbol} {preview}")
-                print()
+                    role_symbol = "👤" if msg.role == 'user' else "🤖"
+                    preview = msg.content[:100] + ("..." if msg.content_length > 100 else "")
+                    parts.append(f"      {role_symbol} {preview}\n")
+                parts.append("\n")
 
             # Show matched message (highlighted)
-            print("    >>> MATCHED MESSAGE <<<")
             role_symbol = "👤" if meta['role'] == 'user' else "🤖"
-            print(f"    {role_symbol} {result['document']}")
-            print()
+            parts.append(f"    >>> MATCHED MESSAGE <<<\n    {role_symbol} {result['document']}\n\n")
 
             # Show next messages
             if context['next']:
-                print("    Context (after):")
+                parts.append("    Context (after):\n")
                 for msg in context['next']:
-                    role_symbol = "👤" if msg['role'] == 'user' else "🤖"
-                    preview = msg['content'][:100] + ("..." if len(msg['content']) > 100 else "")
-                    print(f"      {role_symbol} {preview}")
-                print()
+                    role_symbol = "👤" if msg.role == 'user' else "🤖"
+                    preview = msg.content[:100] + ("..." if msg.content_length > 100 else "")
+                    parts.append(f"      {role_symbol} {preview}\n")
+                parts.append("\n")
 
         else:
             # Just show the matched message
-            print(f"    {result['document']}")
-            print()
+            parts.append(f"    {result['document']}\n\n")
 
-        print(f"{'-'*80}\n")
+        parts.append(f"{'-'*80}\n\n")
+        sys.stdout.write("".join(parts))
 
 
 def search_conversations(
     query: str,
     chroma_path: str,
-    db_path: str,
+    conn: sqlite3.Connection,
     limit: int = 10,
     project: Optional[str] = None,
     role: Optional[str] = None,
     after: Optional[str] = None,
     before: Optional[str] = None,
     context_size: int = 2,
-    show_json: bool = False
+    show_json: bool = False,
+    ndjson: bool = False
 ):
     """
     Search conversations using semantic similarity.
@@ -187,20 +490,18 @@ def search_conversations(
     Args:
         query: Search query text
         chroma_path: Path to ChromaDB storage
-        db_path: Path to SQLite database
+        conn: Open connection to the SQLite database
         limit: Maximum number of results
         project: Filter by project name (substring match)
         role: Filter by role (user/assistant)
         after: Only messages after this date
         before: Only messages before this date
         context_size: Number of messages to show before/after
-        show_json: Output as JSON
+        show_json: Output as a JSON array
+        ndjson: Output as newline-delimited JSON
     """
-    # Load embedding model (same as used for indexing)
-    print("📥 Loading embedding model...")
-    model = SentenceTransformer('all-mpnet-base-v2')
-
-    # Initialize ChromaDB
+    # Validate the ChromaDB collection before anything expensive: a
+    # missing collection should fail fast, not after a ~1.5s model load
     client = chromadb.PersistentClient(path=chroma_path)
 
     try:
@@ -210,6 +511,13 @@ def search_conversations(
         print("   Run embed_conversations.py first to create embeddings.")
         sys.exit(1)
 
+    # Query vectors must come from the same model the index was built with
+    indexed_model = (collection.metadata or {}).get("embedding_model")
+    if indexed_model and indexed_model != MODEL_NAME:
+        print(f"❌ Collection was embedded with '{indexed_model}', but "
+              f"CLAUDE_EMBED_MODEL is '{MODEL_NAME}'.")
+        sys.exit(1)
+
     # Build where clause for filtering
     where_conditions = []
 
@@ -229,51 +537,95 @@ def search_conversations(
     elif len(where_conditions) > 1:
         where_clause = {"$and": where_conditions}
 
-    # Perform search
-    print(f"🔍 Searching for: \"{query}\"")
-    if where_clause:
-        print(f"   Filters: {where_clause}")
+    # Chroma's where-clause can't express substring matches, so the
+    # project filter stays in Python - but overfetch so a selective
+    # filter doesn't silently truncate results below the requested limit
+    n_results = limit * 5 if project else limit
 
-    # Embed the query using the same model
-    query_embedding = model.encode(query, show_progress_bar=False).tolist()
+    formatted_results = []
 
-    results = collection.query(
-        query_embeddings=[query_embedding],
-        n_results=limit,
-        where=where_clause
-    )
+    if not query.strip():
+        # Filter-only listing: no semantic ranking needed, so skip the
+        # model load and the ANN query entirely and scan by metadata
+        print("📋 Listing messages (filters only, no semantic ranking)")
+        if where_clause:
+            print(f"   Filters: {where_clause}")
+
+        listed = collection.get(
+            where=where_clause,
+            limit=n_results,
+            include=["documents", "metadatas"]
+        )
 
-    # Format results
-    formatted_results = []
-    if results['ids'] and results['ids'][0]:
-        for i in range(len(results['ids'][0])):
-            metadata = results['metadatas'][0][i]
+        for i in range(len(listed['ids'])):
+            metadata = listed['metadatas'][i]
 
-            # Post-filter by project name (substring match)
             if project and project.lower() not in metadata.get('project_name', '').lower():
                 continue
 
-            # ChromaDB returns L2 distance by default
-            # Convert to similarity score (1 / (1 + distance))
-            distance = results['distances'][0][i]
-            similarity = 1 / (1 + distance)
-
             formatted_results.append({
-                'id': results['ids'][0][i],
-                'document': results['documents'][0][i],
+                'id': listed['ids'][i],
+                'document': listed['documents'][i],
                 'metadata': metadata,
-                'score': similarity
+                'score': 1.0
             })
 
-        # Trim to limit after filtering
         formatted_results = formatted_results[:limit]
+    else:
+        # Perform semantic search. The embedding comes from the disk
+        # cache, the resident daemon, or a local model load - in that
+        # order of preference.
+        query_embedding = get_query_embedding(query).tolist()
+
+        print(f"🔍 Searching for: \"{query}\"")
+        if where_clause:
+            print(f"   Filters: {where_clause}")
+
+        # Narrow the response to what the display actually reads -
+        # without an explicit include, Chroma also ships the stored
+        # embeddings back (~3KB of floats per result) just to be dropped
+        results = collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            where=where_clause,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        # Score conversion depends on the collection's distance space:
+        # cosine gives calibrated 1 - distance similarities; legacy L2
+        # collections fall back to the monotonic 1/(1+d) squash
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+
+        if results['ids'] and results['ids'][0]:
+            for i in range(len(results['ids'][0])):
+                metadata = results['metadatas'][0][i]
+
+                # Post-filter by project name (substring match)
+                if project and project.lower() not in metadata.get('project_name', '').lower():
+                    continue
+
+                distance = results['distances'][0][i]
+                if space == "cosine":
+                    similarity = 1.0 - distance
+                else:
+                    similarity = 1 / (1 + distance)
+
+                formatted_results.append({
+                    'id': results['ids'][0][i],
+                    'document': results['documents'][0][i],
+                    'metadata': metadata,
+                    'score': similarity
+                })
+
+            # Trim to limit after filtering
+            formatted_results = formatted_results[:limit]
 
     if not formatted_results:
         print("\n❌ No results found")
         return
 
     # Display results
-    display_results(formatted_results, db_path, context_size, show_json)
+    display_results(formatted_results, conn, context_size, show_json, ndjson)
 
 
 def main():
@@ -290,17 +642,46 @@ Examples:
         """
     )
 
-    parser.add_argument("query", help="Search query text")
+    parser.add_argument(
+        "query",
+        nargs="?",
+        default="",
+        help="Search query text (omit to just list messages matching the filters)"
+    )
     parser.add_argument("--limit", type=int, default=10, help="Maximum number of results (default: 10)")
     parser.add_argument("--project", help="Filter by project name (substring match)")
     parser.add_argument("--role", choices=["user", "assistant"], help="Filter by speaker role")
     parser.add_argument("--after", help="Only messages after this date (YYYY-MM-DD)")
     parser.add_argument("--before", help="Only messages before this date (YYYY-MM-DD)")
     parser.add_argument("--context", type=int, default=2, help="Number of messages to show before/after (default: 2)")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--json", action="store_true", help="Output as a JSON array")
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Output as newline-delimited JSON (one result per line, pipe-friendly)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["chroma", "flat"],
+        default="chroma",
+        help="Search backend: chroma (HNSW, default) or flat (exact dot-product "
+             "over the snapshot written by embed_conversations.py)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run as a resident embedding daemon so later searches skip the model load"
+    )
 
     args = parser.parse_args()
 
+    if args.daemon:
+        try:
+            run_embedding_daemon()
+        except KeyboardInterrupt:
+            print("\n🔴 Embedding daemon stopped")
+        return
+
     # Default paths
     home = Path.home()
     db_path = home / "claude-conversations" / "conversations.db"
@@ -316,20 +697,48 @@ Examples:
         print("   Run embed_conversations.py first to create embeddings.")
         sys.exit(1)
 
-    # Perform search
+    # One connection for the whole invocation: repeated context fetches
+    # reuse SQLite's warm page cache, and the mmap pragma serves pages
+    # without a pread per page
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    # WAL-mode reads don't block on a concurrent import writing the
+    # database (the mode sticks to the file once set)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+    # Perform search. Filter-only listings always go through ChromaDB
+    # (the flat snapshot has no metadata to scan by).
     try:
-        search_conversations(
-            query=args.query,
-            chroma_path=str(chroma_path),
-            db_path=str(db_path),
-            limit=args.limit,
-            project=args.project,
-            role=args.role,
-            after=args.after,
-            before=args.before,
-            context_size=args.context,
-            show_json=args.json
-        )
+        if args.backend == "flat" and args.query.strip():
+            search_flat(
+                query=args.query,
+                conn=conn,
+                limit=args.limit,
+                project=args.project,
+                role=args.role,
+                after=args.after,
+                before=args.before,
+                context_size=args.context,
+                show_json=args.json,
+                ndjson=args.ndjson
+            )
+        else:
+            search_conversations(
+                query=args.query,
+                chroma_path=str(chroma_path),
+                conn=conn,
+                limit=args.limit,
+                project=args.project,
+                role=args.role,
+                after=args.after,
+                before=args.before,
+                context_size=args.context,
+                show_json=args.json,
+                ndjson=args.ndjson
+            )
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         sys.exit(1)
@@ -338,6 +747,8 @@ Examples:
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -185,16 +185,17 @@ def search_messages(
     Returns:
         List of matching messages
     """
-    # Build WHERE clause
+    # Build WHERE clause. project_name lives in the projects table (the
+    # FTS index is external-content over messages), hence the joins.
     where_parts = [f"fts_messages MATCH ?"]
     params = [query]
 
     if project:
-        where_parts.append("project_name LIKE ?")
+        where_parts.append("p.project_name LIKE ?")
         params.append(f"%{project}%")
 
     if role:
-        where_parts.append("role = ?")
+        where_parts.append("fts_messages.role = ?")
         params.append(role)
 
     where_clause = " AND ".join(where_parts)
@@ -202,15 +203,17 @@ def search_messages(
     # Use FTS5 rank for relevance sorting
     sql = f"""
     SELECT
-        message_id,
-        session_id,
-        message_index,
-        role,
-        content,
-        project_name,
-        timestamp,
+        fts_messages.message_id,
+        fts_messages.session_id,
+        fts_messages.message_index,
+        fts_messages.role,
+        fts_messages.content,
+        p.project_name,
+        fts_messages.timestamp,
         rank
     FROM fts_messages
+    JOIN sessions s ON fts_messages.session_id = s.session_id
+    JOIN projects p ON s.project_id = p.project_id
     WHERE {where_clause}
     ORDER BY rank
     LIMIT ?
@@ -260,22 +263,24 @@ def search_tools(
     params = [query]
 
     if project:
-        where_parts.append("project_name LIKE ?")
+        where_parts.append("p.project_name LIKE ?")
         params.append(f"%{project}%")
 
     where_clause = " AND ".join(where_parts)
 
     sql = f"""
     SELECT
-        tool_use_id,
-        session_id,
-        tool_name,
-        tool_input,
-        tool_result,
-        project_name,
-        timestamp,
+        fts_tool_uses.tool_use_id,
+        fts_tool_uses.session_id,
+        fts_tool_uses.tool_name,
+        fts_tool_uses.tool_input,
+        fts_tool_uses.tool_result,
+        p.project_name,
+        fts_tool_uses.timestamp,
         rank
     FROM fts_tool_uses
+    JOIN sessions s ON fts_tool_uses.session_id = s.session_id
+    JOIN projects p ON s.project_id = p.project_id
     WHERE {where_clause}
     ORDER BY rank
     LIMIT ?
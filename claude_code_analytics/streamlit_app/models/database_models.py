@@ -65,6 +65,14 @@ class ToolUse(BaseModel):
     is_error: bool = Field(default=False, description="Whether result is an error")
     timestamp: datetime
 
+    # Display helpers precomputed once at fetch time (see DatabaseService)
+    tool_result_truncated: Optional[str] = Field(
+        None, description="tool_result capped at the display limit"
+    )
+    tool_result_overflow: bool = Field(
+        default=False, description="Whether tool_result exceeded the display limit"
+    )
+
     class Config:
         from_attributes = True
 
@@ -1,78 +1,169 @@
 """Analysis runner page."""
 
 import streamlit as st
+import concurrent.futures
+import heapq
 import sys
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
 # Add parent directory to path for imports
 
 from claude_code_analytics import config
-from claude_code_analytics.streamlit_app.services import DatabaseService, AnalysisService, OpenRouterProvider
+from claude_code_analytics.streamlit_app.services import (
+    DatabaseService,
+    AnalysisService,
+    OpenRouterProvider,
+    get_analysis_service,
+    get_database_service,
+)
+from claude_code_analytics.streamlit_app.services.metadata import format_analysis_with_metadata
 from claude_code_analytics.streamlit_app.models import AnalysisType
 
 
-def get_git_commit_id() -> str:
-    """Get current git commit ID."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-        return "unknown"
-    except Exception:
-        return "unknown"
-
-
-def format_analysis_with_metadata(
-    result_text: str,
-    analysis_type: str,
-    analysis_name: str,
-    session_id: str,
-    project_name: str,
-    model_name: str,
-    provider_name: str,
-    input_tokens: int,
-    output_tokens: int,
-) -> str:
-    """Format analysis result with traceability metadata."""
-    git_commit = get_git_commit_id()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    metadata = f"""# {analysis_name}
-
-## Traceability Information
-
-- **Project:** {project_name}
-- **Session ID:** `{session_id}`
-- **Analysis Type:** `{analysis_type}`
-- **Generated:** {timestamp}
-- **LLM Provider:** {provider_name}
-- **Model:** `{model_name}`
-- **Input Tokens:** {input_tokens:,}
-- **Output Tokens:** {output_tokens:,}
-- **Tool Version:** `{git_commit[:8]}`
-- **Full Commit:** `{git_commit}`
-
----
-
-"""
-    return metadata + result_text
-
-# Initialize services
-if "db_service" not in st.session_state:
-    st.session_state.db_service = DatabaseService()
-
-if "analysis_service" not in st.session_state:
-    st.session_state.analysis_service = AnalysisService()
-
-db_service = st.session_state.db_service
-analysis_service = st.session_state.analysis_service
+class _SanitizeTable(dict):
+    """Translate table that keeps alphanumerics and maps everything else
+    to '_'. ASCII is precomputed below; rare non-ASCII codepoints hit
+    __missing__, where LookupError means 'keep the character'."""
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char.isalnum() or char in '-_':
+            raise LookupError
+        return '_'
+
+
+# str.translate runs the per-character loop in C; the old generator
+# expression paid two method calls and a tuple test per character
+_FILENAME_SANITIZE = _SanitizeTable(str.maketrans({
+    c: '_' for c in map(chr, range(128)) if not (c.isalnum() or c in '-_')
+}))
+
+@st.cache_resource
+def _io_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Small worker pool for off-thread file writes, shared across
+    reruns so submitting a save doesn't spawn threads per click."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+
+@st.cache_data(ttl=3600)
+def _load_openrouter_catalog() -> list:
+    """Top-100 newest paid text models from OpenRouter, cached for an
+    hour per server process so browsing models costs one HTTP fetch,
+    not one per rerun or per user."""
+    all_models = OpenRouterProvider.fetch_all_models()
+    # Single fused pass: filter and keep a 100-element heap by creation
+    # date instead of materializing and fully sorting the filtered list
+    return heapq.nlargest(
+        100,
+        (
+            m for m in all_models
+            if 'text' in m['architecture']['output_modalities']
+            and m['pricing']['prompt'] != '0'
+        ),
+        key=lambda m: m['created'],
+    )
+
+
+@st.cache_data
+def _analysis_type_options(_service: AnalysisService):
+    """Analysis-type registry plus prebuilt radio labels. The registry
+    is static for the process lifetime, so no TTL - compute once instead
+    of re-invoking the service and re-formatting labels per rerun."""
+    types = _service.get_available_analysis_types()
+    labels = {
+        f"**{meta.name}**: {meta.description}": key
+        for key, meta in types.items()
+    }
+    return types, labels
+
+
+@st.cache_data(ttl=60)
+def _load_session_labels(_db_service: DatabaseService, limit: int):
+    """(session_id, project_name, start_time) tuples for the selector,
+    cached briefly so every widget interaction doesn't re-run the query.
+    The dropdown only needs these three columns; the full summary row
+    for the chosen session is point-looked-up separately (underscore arg
+    skips hashing the service object)."""
+    return _db_service.get_session_label_tuples(limit=limit)
+
+
+@st.cache_data(ttl=60)
+def _load_session_detail(_db_service: DatabaseService, session_id: str):
+    """Full summary row for one session - an indexed point lookup
+    instead of scanning the whole session list for the metrics row."""
+    return _db_service.get_session_detail(session_id)
+
+
+@st.fragment
+def _model_browser():
+    """Browse-all-models table, isolated in a fragment: selecting a row
+    triggers on_select="rerun", and the fragment boundary keeps that
+    rerun scoped to this block instead of re-executing the whole page
+    (session fetch, type registry, run-button state). The chosen model
+    id is handed to the main script via session state."""
+    import pandas as pd
+
+    # Cached catalog: a hit returns instantly, so the spinner
+    # only actually spins on the hourly refetch
+    with st.spinner("Fetching models from OpenRouter..."):
+        try:
+            text_models = _load_openrouter_catalog()
+        except Exception as e:
+            st.error(f"❌ Failed to fetch models: {e}")
+            text_models = []
+
+    if not text_models:
+        st.session_state.browse_selected_model = None
+        return
+
+    st.success(f"✅ Loaded {len(text_models)} models")
+
+    # Create dataframe column-wise: one list per column instead of a
+    # dict per row. Prices and context stay numeric - display formatting
+    # is applied client-side via column_config, so no per-row f-string
+    # work here, and the columns sort numerically as a bonus.
+    df = pd.DataFrame({
+        'Model ID': [m['id'] for m in text_models],
+        'Name': [m['name'] for m in text_models],
+        'Input $/1M': [float(m['pricing']['prompt']) * 1_000_000 for m in text_models],
+        'Output $/1M': [float(m['pricing']['completion']) * 1_000_000 for m in text_models],
+        'Context': [m['context_length'] for m in text_models],
+    })
+
+    st.markdown("**Select a model (click the checkbox):**")
+
+    # Use dataframe with selection mode
+    event = st.dataframe(
+        df,
+        column_config={
+            'Input $/1M': st.column_config.NumberColumn(format="$%.2f"),
+            'Output $/1M': st.column_config.NumberColumn(format="$%.2f"),
+            'Context': st.column_config.NumberColumn(format="localized"),
+        },
+        use_container_width=True,
+        height=400,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+    )
+
+    # Check if a row was selected
+    if event.selection and event.selection.rows:
+        selected_row_idx = event.selection.rows[0]
+        st.session_state.browse_selected_model = text_models[selected_row_idx]['id']
+
+        st.success(f"✅ Selected: **{text_models[selected_row_idx]['name']}**")
+        st.code(st.session_state.browse_selected_model, language="text")
+    else:
+        st.warning("⚠️ Please select a model from the table above by clicking its checkbox.")
+        # Don't allow analysis to run without selection
+        st.session_state.browse_selected_model = None
+
+
+# Process-wide service singletons (st.cache_resource)
+db_service = get_database_service()
+analysis_service = get_analysis_service()
 
 st.title("🔬 Run Analysis")
 
@@ -80,6 +171,16 @@ st.markdown("""
 Perform AI-powered analysis on your conversation sessions using state-of-the-art LLMs.
 """)
 
+# Surface the outcome of a file save submitted on a previous rerun
+_pending_save = st.session_state.pop("pending_save", None)
+if _pending_save is not None:
+    _save_future, _save_path = _pending_save
+    try:
+        _save_future.result(timeout=10)
+        st.success(f"💾 Saved to: `{_save_path}`")
+    except Exception as e:
+        st.error(f"❌ Failed to save analysis: {e}")
+
 # Check for API key
 api_key_configured = analysis_service.api_key is not None
 
@@ -114,37 +215,38 @@ if not api_key_configured:
 st.subheader("Select Session")
 
 try:
-    # Get recent sessions
-    sessions = db_service.get_session_summaries(limit=50)
+    # Get recent sessions - label tuples only, not full summary rows
+    sessions = _load_session_labels(db_service, 50)
 
     if not sessions:
         st.warning("No sessions found. Import conversations first.")
         st.stop()
 
-    # Create session options
-    session_options = {
-        f"{s.project_name} | {s.session_id[:8]}... | {s.start_time}": s.session_id
-        for s in sessions
-    }
+    # Create session options (labels built once, lookups are O(1))
+    session_option_keys = [
+        f"{project_name} | {session_id[:8]}... | {start_time}"
+        for session_id, project_name, start_time in sessions
+    ]
+    session_id_to_index = {t[0]: i for i, t in enumerate(sessions)}
 
     # Pre-select if coming from browser
     default_index = 0
     if "selected_session_id" in st.session_state:
-        selected_id = st.session_state.selected_session_id
-        matching_keys = [k for k, v in session_options.items() if v == selected_id]
-        if matching_keys:
-            default_index = list(session_options.keys()).index(matching_keys[0])
+        default_index = session_id_to_index.get(st.session_state.selected_session_id, 0)
 
-    selected_session_display = st.selectbox(
+    selected_index = st.selectbox(
         "Choose a session:",
-        options=list(session_options.keys()),
+        options=range(len(sessions)),
+        format_func=lambda i: session_option_keys[i],
         index=default_index,
     )
 
-    selected_session_id = session_options[selected_session_display]
-
-    # Display session info
-    session = next(s for s in sessions if s.session_id == selected_session_id)
+    # Fetch the one selected session's full stats via point lookup
+    selected_session_id = sessions[selected_index][0]
+    session = _load_session_detail(db_service, selected_session_id)
+    if session is None:
+        st.warning("Selected session no longer exists. Re-import conversations.")
+        st.stop()
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Messages", session.message_count)
@@ -157,13 +259,9 @@ try:
     # Analysis type selector
     st.subheader("Select Analysis Type")
 
-    available_types = analysis_service.get_available_analysis_types()
-
-    # Create radio buttons for analysis types
-    analysis_type_options = {
-        f"**{meta.name}**: {meta.description}": key
-        for key, meta in available_types.items()
-    }
+    # Registry and radio labels are cached once per process, not per
+    # session or per rerun
+    available_types, analysis_type_options = _analysis_type_options(analysis_service)
 
     selected_display = st.radio(
         "Choose analysis type:",
@@ -201,8 +299,10 @@ try:
         )
 
         if model_selection_mode == "Quick Select (13 curated models)":
-            # Quick select dropdown
-            model_options = {label: model_id for label, model_id in OpenRouterProvider.QUICK_SELECT_MODELS}
+            # Quick select dropdown (static list - build once per session)
+            if "quick_select_model_options" not in st.session_state:
+                st.session_state.quick_select_model_options = dict(OpenRouterProvider.QUICK_SELECT_MODELS)
+            model_options = st.session_state.quick_select_model_options
 
             selected_model_label = st.selectbox(
                 "Choose model:",
@@ -214,80 +314,9 @@ try:
             selected_model = model_options[selected_model_label]
 
         else:
-            # Browse all models mode
-            import pandas as pd
-
-            # Use session state to cache the models
-            if "all_openrouter_models" not in st.session_state:
-                st.session_state.all_openrouter_models = None
-
-            # Auto-load models when switching to this mode
-            if st.session_state.all_openrouter_models is None:
-                with st.spinner("Fetching models from OpenRouter..."):
-                    try:
-                        all_models = OpenRouterProvider.fetch_all_models()
-
-                        # Filter for text generation models
-                        text_models = [
-                            m for m in all_models
-                            if 'text' in m['architecture']['output_modalities']
-                            and m['pricing']['prompt'] != '0'
-                        ]
-
-                        # Sort by newest first
-                        text_models.sort(key=lambda m: m['created'], reverse=True)
-
-                        # Store in session state (limit to 100 for performance)
-                        st.session_state.all_openrouter_models = text_models[:100]
-
-                    except Exception as e:
-                        st.error(f"❌ Failed to fetch models: {e}")
-                        st.session_state.all_openrouter_models = []
-
-            # Display models if loaded
-            if st.session_state.all_openrouter_models:
-                text_models = st.session_state.all_openrouter_models
-                st.success(f"✅ Loaded {len(text_models)} models")
-
-                # Create dataframe
-                df_data = []
-                for m in text_models:
-                    prompt_price = float(m['pricing']['prompt']) * 1_000_000
-                    completion_price = float(m['pricing']['completion']) * 1_000_000
-                    df_data.append({
-                        'Model ID': m['id'],
-                        'Name': m['name'],
-                        'Input $/1M': f"${prompt_price:.2f}",
-                        'Output $/1M': f"${completion_price:.2f}",
-                        'Context': f"{m['context_length']:,}",
-                    })
-
-                df = pd.DataFrame(df_data)
-
-                st.markdown("**Select a model (click the checkbox):**")
-
-                # Use dataframe with selection mode
-                event = st.dataframe(
-                    df,
-                    use_container_width=True,
-                    height=400,
-                    hide_index=True,
-                    on_select="rerun",
-                    selection_mode="single-row",
-                )
-
-                # Check if a row was selected
-                if event.selection and event.selection.rows:
-                    selected_row_idx = event.selection.rows[0]
-                    selected_model = text_models[selected_row_idx]['id']
-                    selected_model_name = text_models[selected_row_idx]['name']
-
-                    st.success(f"✅ Selected: **{selected_model_name}**")
-                    st.code(selected_model, language="text")
-                else:
-                    st.warning("⚠️ Please select a model from the table above by clicking its checkbox.")
-                    # Don't allow analysis to run without selection
-                    selected_model = None
+            # Browse all models mode (fragment-scoped reruns)
+            _model_browser()
+            selected_model = st.session_state.get("browse_selected_model")
 
         st.divider()
 
@@ -309,76 +338,87 @@ try:
                 st.error("❌ Please enter a custom prompt for analysis.")
                 st.stop()
 
-        with st.spinner("Analyzing conversation... This may take a minute."):
-            try:
-                # Run analysis
-                result = analysis_service.analyze_session(
+        try:
+            # Stream the analysis so first tokens render immediately
+            # instead of blocking behind the full completion
+            st.markdown("### Analysis Result")
+            result_text = st.write_stream(
+                analysis_service.analyze_session_stream(
                     selected_session_id,
                     selected_analysis_type,
                     custom_prompt=custom_prompt,
                     model=selected_model,
                 )
+            )
 
-                st.success("✅ Analysis complete!")
-
-                # Display token usage
-                if result.input_tokens or result.output_tokens:
-                    col1, col2, col3 = st.columns(3)
-                    col1.metric("Input Tokens", f"{result.input_tokens or 0:,}")
-                    col2.metric("Output Tokens", f"{result.output_tokens or 0:,}")
-                    col3.metric("Model", result.model_name or "N/A")
-
-                st.divider()
-
-                # Display result
-                st.markdown("### Analysis Result")
-                st.markdown(result.result_text)
-
-                # Prepare formatted output with metadata
-                provider_name = type(analysis_service.provider).__name__.replace("Provider", "")
-                formatted_result = format_analysis_with_metadata(
-                    result_text=result.result_text,
-                    analysis_type=selected_analysis_type.value,
-                    analysis_name=available_types[selected_analysis_type.value].name,
-                    session_id=selected_session_id,
-                    project_name=session.project_name,
-                    model_name=result.model_name or "unknown",
-                    provider_name=provider_name,
-                    input_tokens=result.input_tokens or 0,
-                    output_tokens=result.output_tokens or 0,
-                )
-
-                # Generate unique filename with timestamp
-                timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-                # Sanitize project name for filename (remove special chars)
-                safe_project_name = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in session.project_name)
-                filename = f"{safe_project_name}_{selected_analysis_type.value}_{timestamp_str}.md"
-
-                # Save to file if requested
-                if save_to_file:
-                    output_dir = config.ANALYSIS_OUTPUT_DIR
-                    output_dir.mkdir(parents=True, exist_ok=True)
-
-                    output_path = output_dir / filename
+            st.success("✅ Analysis complete!")
+
+            # Token usage arrives with the stream's final message
+            usage = getattr(analysis_service.provider, "last_stream_usage", None)
+            input_tokens = usage.input_tokens if usage else None
+            output_tokens = usage.output_tokens if usage else None
+            model_name = (usage.model_name if usage else None) or selected_model
+
+            # Display token usage
+            if input_tokens or output_tokens:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Input Tokens", f"{input_tokens or 0:,}")
+                col2.metric("Output Tokens", f"{output_tokens or 0:,}")
+                col3.metric("Model", model_name or "N/A")
+
+            st.divider()
+
+            # Prepare formatted output with metadata
+            provider_name = type(analysis_service.provider).__name__.replace("Provider", "")
+            formatted_result = format_analysis_with_metadata(
+                result_text=result_text,
+                analysis_type=selected_analysis_type.value,
+                analysis_name=available_types[selected_analysis_type.value].name,
+                session_id=selected_session_id,
+                project_name=session.project_name,
+                model_name=model_name or "unknown",
+                provider_name=provider_name,
+                input_tokens=input_tokens or 0,
+                output_tokens=output_tokens or 0,
+            )
 
-                    with open(output_path, "w") as f:
-                        f.write(formatted_result)
+            # Generate unique filename with timestamp
+            timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Sanitize project name for filename (remove special chars)
+            safe_project_name = session.project_name.translate(_FILENAME_SANITIZE)
+            filename = f"{safe_project_name}_{selected_analysis_type.value}_{timestamp_str}.md"
 
-                    st.success(f"💾 Saved to: `{output_path}`")
+            # Save to file if requested
+            if save_to_file:
+                output_dir = config.ANALYSIS_OUTPUT_DIR
 
-                # Download button
-                st.download_button(
-                    label="📥 Download as Markdown",
-                    data=formatted_result,
-                    file_name=filename,
-                    mime="text/markdown",
-                )
+                # Only stat/create the directory once per session
+                if not st.session_state.get("analysis_output_dir_ready"):
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    st.session_state.analysis_output_dir_ready = True
+
+                output_path = output_dir / filename
+                # Write off the script thread so the download button
+                # renders without waiting on disk; the outcome is shown
+                # at the top of the next rerun
+                save_future = _io_pool().submit(output_path.write_text, formatted_result)
+                st.session_state.pending_save = (save_future, output_path)
+
+                st.info(f"💾 Saving to: `{output_path}`")
+
+            # Download button
+            st.download_button(
+                label="📥 Download as Markdown",
+                data=formatted_result,
+                file_name=filename,
+                mime="text/markdown",
+            )
 
-            except Exception as e:
-                st.error(f"❌ Error running analysis: {e}")
-                import traceback
-                with st.expander("Error details"):
-                    st.code(traceback.format_exc())
+        except Exception as e:
+            st.error(f"❌ Error running analysis: {e}")
+            import traceback
+            with st.expander("Error details"):
+                st.code(traceback.format_exc())
 
 except Exception as e:
     st.error(f"Error loading sessions: {e}")
@@ -8,13 +8,116 @@ from pathlib import Path
 
 # Add parent directory to path for imports
 
-from claude_code_analytics.streamlit_app.services import DatabaseService
+from claude_code_analytics.streamlit_app.services import DatabaseService, get_database_service
 
 # Initialize service
-if "db_service" not in st.session_state:
-    st.session_state.db_service = DatabaseService()
+db_service = get_database_service()
+
+
+# Short-TTL caches so the slider and other widget interactions don't
+# re-run every aggregate query on each rerun; the underscore arg keeps
+# Streamlit from trying to hash the service object
+@st.cache_data(ttl=60)
+def _load_tool_usage(_db_service: DatabaseService, top_n=None):
+    return _db_service.get_tool_usage_summary(top_n=top_n)
+
+
+@st.cache_data(ttl=60)
+def _load_daily_stats(_db_service: DatabaseService, days: int):
+    return _db_service.get_daily_statistics(days=days)
+
+
+@st.cache_data(ttl=60)
+def _load_project_summaries(_db_service: DatabaseService, top_n=None):
+    return _db_service.get_project_summaries(top_n=top_n)
+
+
+@st.cache_data(ttl=60)
+def _load_period_totals(_db_service: DatabaseService, days: int):
+    return _db_service.get_period_totals(days=days)
+
+
+def _area_chart(df):
+    """Shared area-chart spec: both time-series charts differ only in
+    data and encodings, so build the common mark/size part once."""
+    return alt.Chart(df).mark_area(opacity=0.7).properties(height=300)
+
+
+@st.fragment
+def _daily_section():
+    """Daily Activity section, isolated in a fragment so dragging the
+    days slider reruns only this block - the tool-usage and project
+    sections above and below keep their rendered output."""
+    st.subheader("📅 Daily Activity")
+
+    days_to_show = st.slider("Days to show:", min_value=7, max_value=90, value=30)
+
+    daily_stats = _load_daily_stats(db_service, days_to_show)
+
+    if not daily_stats:
+        st.info("No daily statistics available.")
+        return
+
+    # Columnar build with the date column typed up front: one
+    # to_datetime pass at construction (cache=True dedupes repeated
+    # date strings) instead of building from row dicts and then
+    # rewriting the column
+    daily_df = pd.DataFrame({
+        "date": pd.to_datetime([d["date"] for d in daily_stats], cache=True),
+        "sessions": [d["sessions"] for d in daily_stats],
+        "messages": [d["messages"] for d in daily_stats],
+        "input_tokens": [d["input_tokens"] for d in daily_stats],
+        "output_tokens": [d["output_tokens"] for d in daily_stats],
+    })
+
+    # Messages over time
+    st.markdown("#### Messages Over Time")
+
+    messages_chart = _area_chart(daily_df).encode(
+        x=alt.X("date:T", title="Date"),
+        y=alt.Y("messages:Q", title="Messages"),
+        tooltip=["date:T", "messages:Q", "sessions:Q"],
+    )
+
+    st.altair_chart(messages_chart, use_container_width=True)
+
+    # Token usage over time
+    if "input_tokens" in daily_df.columns:
+        st.markdown("#### Token Usage Over Time")
+
+        # Prepare data for stacked area chart; melt allocates its own
+        # output, so no intermediate column-slice copy is needed
+        token_df_melted = daily_df.melt(
+            id_vars=["date"],
+            value_vars=["input_tokens", "output_tokens"],
+            var_name="token_type",
+            value_name="tokens",
+        )
+
+        token_chart = _area_chart(token_df_melted).encode(
+            x=alt.X("date:T", title="Date"),
+            y=alt.Y("tokens:Q", title="Tokens"),
+            color=alt.Color(
+                "token_type:N",
+                title="Token Type",
+                scale=alt.Scale(scheme="category10"),
+            ),
+            tooltip=["date:T", "token_type:N", "tokens:Q"],
+        )
+
+        st.altair_chart(token_chart, use_container_width=True)
+
+    # Summary metrics - one SQL aggregate query instead of four pandas
+    # sums per rerun (and DISTINCT session counting doesn't double-count
+    # sessions that span a midnight, unlike summing the per-day rows)
+    totals = _load_period_totals(db_service, days_to_show)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Sessions", f"{totals['sessions']:,}")
+    col2.metric("Total Messages", f"{totals['messages']:,}")
+    col3.metric("Input Tokens", f"{totals['input_tokens']:,}")
+    col4.metric("Output Tokens", f"{totals['output_tokens']:,}")
 
-db_service = st.session_state.db_service
 
 st.title("📊 Analytics Dashboard")
 
@@ -26,13 +129,20 @@ try:
     # === Tool Usage Statistics ===
     st.subheader("🔧 Tool Usage Statistics")
 
-    tool_usage = db_service.get_tool_usage_summary()
+    tool_usage = _load_tool_usage(db_service)
 
     if not tool_usage:
         st.info("No tool usage data available.")
     else:
-        # Create DataFrame
-        tools_df = pd.DataFrame([t.model_dump() for t in tool_usage])
+        # Create DataFrame column-wise: attribute reads per column skip
+        # the per-row model_dump() dict plus pandas' row-dict alignment
+        tool_cols = (
+            "tool_name", "total_uses", "error_count", "error_rate_percent",
+            "sessions_used_in", "first_used", "last_used",
+        )
+        tools_df = pd.DataFrame(
+            {c: [getattr(t, c) for t in tool_usage] for c in tool_cols}
+        )
 
         # Display as table
         st.dataframe(
@@ -53,10 +163,15 @@ try:
             use_container_width=True,
         )
 
-        # Tool usage chart
+        # Tool usage chart - top 10 via SQL LIMIT (cached separately), so
+        # the browser payload is 10 rows instead of a pandas head() slice
         st.markdown("#### Tool Usage Distribution")
 
-        chart_data = tools_df[["tool_name", "total_uses"]].head(10)
+        top_tools = _load_tool_usage(db_service, top_n=10)
+        chart_data = pd.DataFrame({
+            "tool_name": [t.tool_name for t in top_tools],
+            "total_uses": [t.total_uses for t in top_tools],
+        })
 
         chart = (
             alt.Chart(chart_data)
@@ -74,93 +189,28 @@ try:
 
     st.divider()
 
-    # === Daily Statistics ===
-    st.subheader("📅 Daily Activity")
-
-    days_to_show = st.slider("Days to show:", min_value=7, max_value=90, value=30)
-
-    daily_stats = db_service.get_daily_statistics(days=days_to_show)
-
-    if not daily_stats:
-        st.info("No daily statistics available.")
-    else:
-        daily_df = pd.DataFrame(daily_stats)
-        daily_df["date"] = pd.to_datetime(daily_df["date"])
-
-        # Messages over time
-        st.markdown("#### Messages Over Time")
-
-        messages_chart = (
-            alt.Chart(daily_df)
-            .mark_area(opacity=0.7)
-            .encode(
-                x=alt.X("date:T", title="Date"),
-                y=alt.Y("messages:Q", title="Messages"),
-                tooltip=["date:T", "messages:Q", "sessions:Q"],
-            )
-            .properties(height=300)
-        )
-
-        st.altair_chart(messages_chart, use_container_width=True)
-
-        # Token usage over time
-        if "input_tokens" in daily_df.columns:
-            st.markdown("#### Token Usage Over Time")
-
-            # Prepare data for stacked area chart
-            token_df = daily_df[["date", "input_tokens", "output_tokens"]].copy()
-            token_df_melted = token_df.melt(
-                id_vars=["date"],
-                value_vars=["input_tokens", "output_tokens"],
-                var_name="token_type",
-                value_name="tokens",
-            )
-
-            token_chart = (
-                alt.Chart(token_df_melted)
-                .mark_area(opacity=0.7)
-                .encode(
-                    x=alt.X("date:T", title="Date"),
-                    y=alt.Y("tokens:Q", title="Tokens"),
-                    color=alt.Color(
-                        "token_type:N",
-                        title="Token Type",
-                        scale=alt.Scale(scheme="category10"),
-                    ),
-                    tooltip=["date:T", "token_type:N", "tokens:Q"],
-                )
-                .properties(height=300)
-            )
-
-            st.altair_chart(token_chart, use_container_width=True)
-
-        # Summary metrics
-        col1, col2, col3, col4 = st.columns(4)
-
-        total_sessions = daily_df["sessions"].sum()
-        total_messages = daily_df["messages"].sum()
-        total_input_tokens = daily_df["input_tokens"].sum() if "input_tokens" in daily_df.columns else 0
-        total_output_tokens = daily_df["output_tokens"].sum() if "output_tokens" in daily_df.columns else 0
-
-        col1.metric("Total Sessions", f"{total_sessions:,}")
-        col2.metric("Total Messages", f"{total_messages:,}")
-        col3.metric("Input Tokens", f"{total_input_tokens:,}")
-        col4.metric("Output Tokens", f"{total_output_tokens:,}")
+    # === Daily Statistics === (fragment: slider reruns stay scoped)
+    _daily_section()
 
     st.divider()
 
     # === Project Statistics ===
     st.subheader("📁 Project Statistics")
 
-    projects = db_service.get_project_summaries()
+    projects = _load_project_summaries(db_service)
 
     if not projects:
         st.info("No projects found.")
     else:
-        projects_df = pd.DataFrame([p.model_dump() for p in projects])
-
-        # Ensure proper sorting by total_messages
-        projects_df = projects_df.sort_values('total_messages', ascending=False)
+        # Column-wise build, same as tools_df above; the query already
+        # returns rows ordered by total_messages DESC, so no re-sort
+        project_cols = (
+            "project_id", "project_name", "total_sessions", "total_messages",
+            "total_tool_uses", "first_session", "last_session",
+        )
+        projects_df = pd.DataFrame(
+            {c: [getattr(p, c) for p in projects] for c in project_cols}
+        )
 
         st.dataframe(
             projects_df,
@@ -177,10 +227,14 @@ try:
             use_container_width=True,
         )
 
-        # Project distribution chart
+        # Project distribution chart - top 10 straight from SQL
         st.markdown("#### Messages by Project")
 
-        project_chart_data = projects_df[["project_name", "total_messages"]].head(10)
+        top_projects = _load_project_summaries(db_service, top_n=10)
+        project_chart_data = pd.DataFrame({
+            "project_name": [p.project_name for p in top_projects],
+            "total_messages": [p.total_messages for p in top_projects],
+        })
 
         project_chart = (
             alt.Chart(project_chart_data)
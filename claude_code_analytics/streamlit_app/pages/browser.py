@@ -7,13 +7,30 @@ from pathlib import Path
 
 # Add parent directory to path for imports
 
-from claude_code_analytics.streamlit_app.services import DatabaseService
+from claude_code_analytics.streamlit_app.services import DatabaseService, get_database_service
+from claude_code_analytics.streamlit_app.models import ProjectSummary, SessionSummary
 
 # Initialize service
-if "db_service" not in st.session_state:
-    st.session_state.db_service = DatabaseService()
+db_service = get_database_service()
+
+
+# Short-TTL caches: selectbox changes rerun the whole script, and these
+# queries dominate page latency. The underscore arg keeps Streamlit from
+# hashing the service object; the scalar args key the cache cheaply.
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_project_summaries(_db_service: DatabaseService):
+    return _db_service.get_project_summaries()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_session_summaries(_db_service: DatabaseService, project_id: str):
+    return _db_service.get_session_summaries(project_id=project_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_token_usage(_db_service: DatabaseService, session_id: str):
+    return _db_service.get_token_usage_for_session(session_id)
 
-db_service = st.session_state.db_service
 
 st.title("📚 Browse Sessions")
 
@@ -23,7 +40,7 @@ Browse and explore your Claude Code conversation sessions organized by project.
 
 # Display quick stats at the top
 try:
-    projects = db_service.get_project_summaries()
+    projects = _load_project_summaries(db_service)
 
     col1, col2, col3, col4 = st.columns(4)
 
@@ -44,10 +61,9 @@ except Exception as e:
     st.info("Make sure you've created the database and imported conversations.")
     st.stop()
 
-# Get all projects
+# Browse projects - reuses the list already fetched for the stats row
+# above (the stats block st.stop()s on failure, so it's always bound)
 try:
-    projects = db_service.get_project_summaries()
-
     if not projects:
         st.warning("No projects found. Import conversations first.")
         st.stop()
@@ -63,7 +79,7 @@ try:
         selected_project_id = project_names[selected_project_name]
 
         # Get sessions for selected project
-        sessions = db_service.get_session_summaries(project_id=selected_project_id)
+        sessions = _load_session_summaries(db_service, selected_project_id)
 
         if not sessions:
             st.info("No sessions found for this project.")
@@ -99,7 +115,7 @@ try:
                 st.subheader("Session Details")
 
                 # Get token usage
-                token_usage = db_service.get_token_usage_for_session(selected_session_id)
+                token_usage = _load_token_usage(db_service, selected_session_id)
 
                 col1, col2, col3 = st.columns(3)
 
@@ -114,8 +130,16 @@ try:
             st.divider()
             st.subheader(f"All Sessions in {selected_project_name}")
 
-            # Create DataFrame
-            sessions_df = pd.DataFrame([s.model_dump() for s in sessions])
+            # Create DataFrame column-wise: one attribute-read list per
+            # field instead of a model_dump() dict per row, so pandas
+            # ingests homogeneous columns directly. Arrow-backed dtypes
+            # let Streamlit ship the frame to the frontend without the
+            # object-dtype -> Arrow conversion it does per render
+            # (pyarrow is already a hard Streamlit dependency).
+            sessions_df = pd.DataFrame({
+                f: [getattr(s, f) for s in sessions]
+                for f in SessionSummary.model_fields
+            }).convert_dtypes(dtype_backend="pyarrow")
 
             # Display sessions
             st.dataframe(
@@ -143,8 +167,12 @@ try:
     st.divider()
     st.subheader("All Projects")
 
-    # Create a DataFrame for better display
-    projects_df = pd.DataFrame([p.model_dump() for p in projects])
+    # Create a DataFrame for better display (column-wise and
+    # Arrow-backed, as above)
+    projects_df = pd.DataFrame({
+        f: [getattr(p, f) for p in projects]
+        for f in ProjectSummary.model_fields
+    }).convert_dtypes(dtype_backend="pyarrow")
 
     # Display projects as a table
     st.dataframe(
@@ -1,20 +1,43 @@
 """Conversation viewer page with terminal-style chat interface."""
 
 import streamlit as st
+import streamlit.components.v1 as components
+import pandas as pd
 import sys
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime
 
 # Add parent directory to path for imports
 
 from claude_code_analytics import config
-from claude_code_analytics.streamlit_app.services import DatabaseService
+from claude_code_analytics.streamlit_app.services import DatabaseService, get_database_service
 
 # Initialize service
-if "db_service" not in st.session_state:
-    st.session_state.db_service = DatabaseService()
+db_service = get_database_service()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_session(_db_service: DatabaseService, session_id: str):
+    """Session header row, cached so filter/pagination reruns skip the
+    point lookup (underscore arg skips hashing the service object)."""
+    return _db_service.get_session(session_id)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_conversation(session_id: str, role=None, search=None):
+    """Load messages and tool uses for a session, cached across reruns.
+
+    Pagination clicks and checkbox toggles rerun the whole script; the
+    cache means SQLite is only hit on first view of each
+    (session, filter) combination. Tool uses come back already bucketed
+    by message index so reruns don't rebuild the lookup dict.
+    """
+    messages, tool_uses = db_service.get_messages_and_tools_for_session(
+        session_id, role=role, search=search, hide_empty=True
+    )
+    return messages, db_service.group_tools_by_message(tool_uses)
 
-db_service = st.session_state.db_service
 
 # Custom CSS for message styling and highlighting
 st.markdown("""
@@ -73,7 +96,7 @@ else:
 
 # Get session info
 try:
-    session = db_service.get_session(session_id)
+    session = _load_session(db_service, session_id)
 
     if not session:
         st.error(f"Session not found: {session_id}")
@@ -118,32 +141,16 @@ try:
         st.write("")
         show_tokens = st.checkbox("Show tokens", value=False)
 
-    # Get messages
-    messages = db_service.get_messages_for_session(session_id)
-
-    # Get tool uses and create a lookup by message index
-    tool_uses = db_service.get_tool_uses_for_session(session_id)
-    tools_by_message = {}
-    for tool in tool_uses:
-        if tool.message_index not in tools_by_message:
-            tools_by_message[tool.message_index] = []
-        tools_by_message[tool.message_index].append(tool)
-
-    # Apply filters
-    if role_filter != "All":
-        messages = [m for m in messages if m.role == role_filter.lower()]
-
-    if search_query:
-        messages = [
-            m for m in messages
-            if m.content and search_query.lower() in m.content.lower()
-        ]
-
-    # Filter out messages with no content UNLESS they have tool uses
-    messages = [
-        m for m in messages
-        if (m.content and m.content.strip()) or (m.message_index in tools_by_message)
-    ]
+    # Get messages and tool uses in a single DB round-trip (cached per
+    # session+filter combination). Role and search filters are pushed into
+    # SQL instead of rescanning the full message list in Python.
+    messages, tools_by_message = _load_conversation(
+        session_id,
+        role=role_filter.lower() if role_filter != "All" else None,
+        search=search_query or None,
+    )
+
+    # Content-empty messages without tool uses are filtered out in SQL
 
     # Auto-pagination for large conversations (configurable via .env)
     PAGINATION_THRESHOLD = config.PAGINATION_THRESHOLD
@@ -155,11 +162,15 @@ try:
     if use_pagination:
         # Calculate which page to show
         if target_message_index is not None:
-            # Find position of target message in filtered list
-            target_position = next(
-                (i for i, m in enumerate(messages) if m.message_index == target_message_index),
-                0
-            )
+            # Find position of target message in filtered list. Messages
+            # are sorted by message_index, so binary search instead of a
+            # linear scan.
+            indices = [m.message_index for m in messages]
+            pos = bisect_left(indices, target_message_index)
+            if pos < len(indices) and indices[pos] == target_message_index:
+                target_position = pos
+            else:
+                target_position = 0
             # Calculate page number (0-indexed)
             initial_page = target_position // MESSAGES_PER_PAGE
         else:
@@ -186,14 +197,27 @@ try:
         messages_to_display = messages
         st.write(f"**Showing {len(messages)} message(s)**")
 
-    # Scroll to bottom button (only for non-paginated view)
+    # Scroll to bottom button (only for non-paginated view). Raw <script>
+    # tags in st.markdown get stripped, so the buttons just record the
+    # request and a single components.html block at the end executes it.
+    scroll_request = None
     if not use_pagination and len(messages) > 5:
         if st.button("⬇️ Scroll to Bottom"):
-            st.markdown('<script>window.scrollTo(0, document.body.scrollHeight);</script>', unsafe_allow_html=True)
+            scroll_request = "window.parent.scrollTo(0, window.parent.document.body.scrollHeight);"
 
     st.divider()
 
-    # Display messages in simple terminal style
+    # Display messages in simple terminal style.
+    # Streamlit's per-widget overhead dominates render time for long pages,
+    # so batch consecutive markdown chunks into a single st.markdown call
+    # and only break out for st.code blocks (tool results).
+    pending_chunks = []
+
+    def flush_chunks():
+        if pending_chunks:
+            st.markdown("\n\n".join(pending_chunks), unsafe_allow_html=True)
+            pending_chunks.clear()
+
     for msg in messages_to_display:
         # Determine if this message should be highlighted
         is_target = target_message_index is not None and msg.message_index == target_message_index
@@ -219,32 +243,52 @@ try:
             header_parts.append(f"`{' '.join(token_parts)}`")
 
         # Start message container with ID
-        st.markdown(f'<div id="{message_id}" class="{container_class}">', unsafe_allow_html=True)
-        st.markdown(" · ".join(header_parts))
+        pending_chunks.append(f'<div id="{message_id}" class="{container_class}">')
+        pending_chunks.append(" · ".join(header_parts))
 
         # Message content
         if msg.content and msg.content.strip():
-            st.markdown(msg.content)
+            pending_chunks.append(msg.content)
 
         # Tool uses
         message_tools = tools_by_message.get(msg.message_index, [])
-        if message_tools:
+        if len(message_tools) > 20:
+            # Heavy tool batches: a single virtualized dataframe instead of
+            # dozens of code blocks - the grid only renders visible rows
+            flush_chunks()
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "tool": t.tool_name,
+                        "error": t.is_error,
+                        "result": t.tool_result_truncated or "",
+                    }
+                    for t in message_tools
+                ]),
+                use_container_width=True,
+                height=400,
+            )
+        elif message_tools:
             for tool in message_tools:
                 error_indicator = " ❌" if tool.is_error else ""
-                st.markdown(f"🔧 **{tool.tool_name}**{error_indicator}")
 
-                if tool.tool_result:
-                    max_length = config.TOOL_RESULT_MAX_LENGTH
-                    result_text = tool.tool_result[:max_length]
-                    if len(tool.tool_result) > max_length:
-                        result_text += "\n... (output truncated)"
-                    st.code(result_text, language="text")
+                if tool.tool_result_truncated:
+                    # Collapsed expander defers the client-side cost of the
+                    # code widget until the user actually opens the result;
+                    # truncation was precomputed at fetch time
+                    flush_chunks()
+                    with st.expander(f"🔧 {tool.tool_name}{error_indicator}", expanded=False):
+                        st.code(tool.tool_result_truncated, language="text")
+                else:
+                    pending_chunks.append(f"🔧 **{tool.tool_name}**{error_indicator}")
 
         # Close message container
-        st.markdown('</div>', unsafe_allow_html=True)
+        pending_chunks.append('</div>')
 
         # Divider between messages
-        st.markdown('<div class="msg-divider"></div>', unsafe_allow_html=True)
+        pending_chunks.append('<div class="msg-divider"></div>')
+
+    flush_chunks()
 
     # Pagination controls (for paginated view)
     if use_pagination:
@@ -284,37 +328,43 @@ try:
             if current_page < total_pages - 1:
                 st.button("Next Page →", key=f"next_btn_{session_id}", on_click=go_to_next_page)
 
-    # Scroll handling - use deep linking approach for consistent behavior
-    import streamlit.components.v1 as components
+    # Scroll to top button at bottom (for non-paginated view)
+    if not use_pagination and len(messages_to_display) > 5:
+        st.divider()
+        if st.button("⬆️ Scroll to Top"):
+            scroll_request = "window.parent.scrollTo(0, 0);"
 
-    # Determine which message to scroll to
-    if target_message_index is not None:
-        # Deep linking from search - scroll to target message
-        scroll_to_message = target_message_index
-    elif use_pagination and len(messages_to_display) > 0:
-        # Regular pagination - scroll to first message on page
-        scroll_to_message = messages_to_display[0].message_index
+    # Scroll handling - one injected script block per rerun, shared by the
+    # deep-link / pagination targeting and the scroll buttons
+    if scroll_request:
+        scroll_js = scroll_request
     else:
-        scroll_to_message = None
+        # Determine which message to scroll to
+        if target_message_index is not None:
+            # Deep linking from search - scroll to target message
+            scroll_to_message = target_message_index
+        elif use_pagination and len(messages_to_display) > 0:
+            # Regular pagination - scroll to first message on page
+            scroll_to_message = messages_to_display[0].message_index
+        else:
+            scroll_to_message = None
 
-    if scroll_to_message is not None:
+        scroll_js = None
+        if scroll_to_message is not None:
+            scroll_js = f"""const targetElement = window.parent.document.getElementById('msg-{scroll_to_message}');
+                if (targetElement) {{
+                    targetElement.scrollIntoView({{ behavior: 'instant', block: 'start' }});
+                }}"""
+
+    if scroll_js:
         components.html(f"""
         <script>
             setTimeout(function() {{
-                const targetElement = window.parent.document.getElementById('msg-{scroll_to_message}');
-                if (targetElement) {{
-                    targetElement.scrollIntoView({{ behavior: 'instant', block: 'start' }});
-                }}
+                {scroll_js}
             }}, 100);
         </script>
         """, height=0)
 
-    # Scroll to top button at bottom (for non-paginated view)
-    if not use_pagination and len(messages_to_display) > 5:
-        st.divider()
-        if st.button("⬆️ Scroll to Top"):
-            st.markdown('<script>window.scrollTo(0, 0);</script>', unsafe_allow_html=True)
-
 except Exception as e:
     st.error(f"Error loading conversation: {e}")
     import traceback
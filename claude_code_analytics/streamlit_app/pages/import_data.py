@@ -1,9 +1,14 @@
 """Import Data page for Claude Code Analytics."""
 
 import streamlit as st
+import contextlib
+import functools
+import os
 import sys
 import sqlite3
+import mmap
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Tuple, Optional
@@ -13,13 +18,24 @@ from typing import Tuple, Optional
 from claude_code_analytics import config
 from claude_code_analytics.streamlit_app.services import DatabaseService
 
-# Import the import logic from scripts
-scripts_path = Path(__file__).parent.parent.parent / "scripts"
-sys.path.insert(0, str(scripts_path))
+@functools.lru_cache(maxsize=1)
+def _import_modules():
+    """
+    Load the scripts/ import machinery lazily.
+
+    Only run_import needs these modules; deferring the imports keeps page
+    renders (and the rest of the app) from paying their import cost.
+    """
+    scripts_path = Path(__file__).parent.parent.parent / "scripts"
+    if str(scripts_path) not in sys.path:
+        sys.path.insert(0, str(scripts_path))
+
+    import import_conversations
+    from create_database import create_database
+    from create_fts_index import create_fts_index
+
+    return import_conversations, create_database, create_fts_index
 
-import import_conversations
-from create_database import create_database
-from create_fts_index import create_fts_index
 
 # Initialize service
 db_service = DatabaseService()
@@ -40,11 +56,26 @@ The import process:
 st.divider()
 
 
-def check_for_new_data() -> Tuple[bool, int, int]:
+@st.cache_resource(show_spinner=False)
+def _detection_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Long-lived connection for the detection check, shared across reruns.
+
+    Kept read/write (rather than mode=ro) because the check maintains the
+    file_scan_cache table; the win is skipping connect/close per rerun.
+    """
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _check_for_new_data_cached(source_mtime: float, db_mtime: float) -> Tuple[bool, int, int]:
     """
     Lightweight check for new data available to import.
     Compares database max message index against file line count.
 
+    The mtime arguments are only used as the cache key - the cache is
+    invalidated whenever the source directory or database changes.
+
     Returns:
         Tuple of (has_new_data, new_sessions_count, updated_sessions_count)
     """
@@ -60,13 +91,35 @@ def check_for_new_data() -> Tuple[bool, int, int]:
         jsonl_count = sum(1 for _ in source_path.rglob('*.jsonl'))
         return (jsonl_count > 0, jsonl_count, 0)
 
-    conn = sqlite3.connect(str(db_path))
+    conn = _detection_conn(str(db_path))
     cursor = conn.cursor()
 
     new_sessions = 0
     updated_sessions = 0
 
     try:
+        # Ensure the scan cache exists (databases created before it was added)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS file_scan_cache (
+                session_id TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                message_count INTEGER NOT NULL
+            )
+        """)
+
+        # Load cached per-file message counts keyed on (mtime, size)
+        cursor.execute("SELECT session_id, mtime, size, message_count FROM file_scan_cache")
+        scan_cache = {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+
+        # One grouped query for all sessions instead of a MAX() query per file
+        cursor.execute("""
+            SELECT session_id, MAX(message_index)
+            FROM messages
+            GROUP BY session_id
+        """)
+        max_index_by_session = dict(cursor.fetchall())
+
         # Get all project directories
         project_dirs = [d for d in source_path.iterdir() if d.is_dir()]
 
@@ -77,29 +130,43 @@ def check_for_new_data() -> Tuple[bool, int, int]:
             for jsonl_file in jsonl_files:
                 session_id = jsonl_file.stem
 
-                # First, count actual messages in file (user/assistant roles only)
-                file_message_count = 0
+                # Skip the line scan entirely when the file hasn't changed
                 try:
-                    with open(jsonl_file, 'r') as f:
-                        for line in f:
-                            if '"message"' in line and ('"role":"user"' in line or '"role":"assistant"' in line):
-                                file_message_count += 1
-                except:
+                    stat = jsonl_file.stat()
+                except OSError:
                     continue
 
+                cached = scan_cache.get(session_id)
+                if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+                    file_message_count = cached[2]
+                else:
+                    # Count actual messages in file (user/assistant roles only).
+                    # mmap + bytes.count runs the search in C instead of a
+                    # Python-level per-line loop.
+                    file_message_count = 0
+                    if stat.st_size > 0:
+                        try:
+                            with open(jsonl_file, 'rb') as f:
+                                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                                    if mm.find(b'"message"') != -1:
+                                        file_message_count = (
+                                            mm.count(b'"role":"user"')
+                                            + mm.count(b'"role":"assistant"')
+                                        )
+                        except OSError:
+                            continue
+
+                    cursor.execute("""
+                        INSERT OR REPLACE INTO file_scan_cache (session_id, mtime, size, message_count)
+                        VALUES (?, ?, ?, ?)
+                    """, (session_id, stat.st_mtime, stat.st_size, file_message_count))
+
                 # Skip files with no importable messages
                 if file_message_count == 0:
                     continue
 
                 # Check if session exists and get max message index
-                cursor.execute("""
-                    SELECT MAX(message_index)
-                    FROM messages
-                    WHERE session_id = ?
-                """, (session_id,))
-
-                result = cursor.fetchone()
-                max_message_index = result[0] if result and result[0] is not None else None
+                max_message_index = max_index_by_session.get(session_id)
 
                 if max_message_index is None:
                     # Session doesn't exist in database and has messages
@@ -112,13 +179,36 @@ def check_for_new_data() -> Tuple[bool, int, int]:
                     if file_message_count > db_message_count:
                         updated_sessions += 1
 
+        # Persist any newly scanned file entries
+        conn.commit()
+
     finally:
-        conn.close()
+        # The connection is shared across reruns - don't close it, just
+        # make sure a failed scan doesn't leave a transaction open
+        if conn.in_transaction:
+            conn.rollback()
 
     has_new_data = (new_sessions + updated_sessions) > 0
     return (has_new_data, new_sessions, updated_sessions)
 
 
+def check_for_new_data() -> Tuple[bool, int, int]:
+    """
+    Cached detection check, keyed on source directory and database mtimes.
+
+    Widget interactions rerun the whole page; caching on the mtimes means
+    the filesystem walk only happens when something actually changed (or
+    the TTL expires).
+    """
+    db_path = config.DATABASE_PATH
+    source_path = config.CLAUDE_CODE_PROJECTS_DIR
+
+    source_mtime = source_path.stat().st_mtime if source_path.exists() else 0.0
+    db_mtime = db_path.stat().st_mtime if db_path.exists() else 0.0
+
+    return _check_for_new_data_cached(source_mtime, db_mtime)
+
+
 def run_import() -> Tuple[int, int, int, int]:
     """
     Run the import process and return statistics.
@@ -126,6 +216,8 @@ def run_import() -> Tuple[int, int, int, int]:
     Returns:
         Tuple of (projects, sessions, messages, tool_uses) imported
     """
+    import_conversations, create_database, create_fts_index = _import_modules()
+
     db_path = config.DATABASE_PATH
     source_path = config.CLAUDE_CODE_PROJECTS_DIR
 
@@ -143,73 +235,104 @@ def run_import() -> Tuple[int, int, int, int]:
         st.error(f"❌ Source directory not found: {source_path}")
         return (0, 0, 0, 0)
 
-    # Connect to database
-    conn = sqlite3.connect(str(db_path))
-    conn.execute("PRAGMA foreign_keys = ON")
-
-    try:
-        # Find all project directories
-        project_dirs = [d for d in source_path.iterdir() if d.is_dir()]
-
-        if not project_dirs:
-            st.warning("⚠️ No project directories found")
-            return (0, 0, 0, 0)
-
-        # Import each project
-        total_projects = 0
-        total_sessions = 0
-        total_messages = 0
-        total_tool_uses = 0
-
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    # Connect to database with bulk-load pragmas: WAL journaling and no
+    # fsync per commit while importing. The whole run is one transaction
+    # (sqlite3 auto-begins on first INSERT; run_import commits once).
+    # contextlib.closing guarantees exactly one close on every path.
+    with contextlib.closing(sqlite3.connect(str(db_path))) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-200000")
+        conn.execute("PRAGMA foreign_keys=ON")
 
-        for idx, project_dir in enumerate(project_dirs):
-            project_name = import_conversations.decode_project_name(project_dir.name)
-            status_text.text(f"Importing: {project_name}")
-
-            try:
-                sessions, messages, tool_uses = import_conversations.import_project(project_dir, conn)
-
-                if sessions > 0:
-                    total_projects += 1
-                    total_sessions += sessions
-                    total_messages += messages
-                    total_tool_uses += tool_uses
-
-            except Exception as e:
-                st.warning(f"⚠️ Error importing {project_name}: {e}")
-                continue
+        try:
+            # Find all project directories
+            project_dirs = [d for d in source_path.iterdir() if d.is_dir()]
+
+            if not project_dirs:
+                st.warning("⚠️ No project directories found")
+                return (0, 0, 0, 0)
+
+            # Parse JSONL in worker threads, but only one project ahead of
+            # the writer. SQLite only allows a single writer, so parsing is
+            # the part worth parallelizing - and parsed dicts are several
+            # times larger than the raw JSON, so prefetching the whole
+            # corpus up front would hold every transcript in memory at
+            # once. A one-project window keeps at most two projects'
+            # entries alive: the one being written and the one parsing.
+            def _submit_parse(project_dir, executor):
+                return {
+                    f: executor.submit(import_conversations.parse_jsonl_file, f)
+                    for f in project_dir.glob('*.jsonl')
+                }
+
+            # Import each project
+            total_projects = 0
+            total_sessions = 0
+            total_messages = 0
+            total_tool_uses = 0
+
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                pending = _submit_parse(project_dirs[0], executor)
+
+                for idx, project_dir in enumerate(project_dirs):
+                    project_name = import_conversations.decode_project_name(project_dir.name)
+                    status_text.text(f"Importing: {project_name}")
+
+                    current = pending
+                    if idx + 1 < len(project_dirs):
+                        pending = _submit_parse(project_dirs[idx + 1], executor)
+
+                    try:
+                        parsed_sessions = {f: fut.result() for f, fut in current.items()}
+                        sessions, messages, tool_uses = import_conversations.import_project(
+                            project_dir, conn, parsed_sessions=parsed_sessions
+                        )
+
+                        if sessions > 0:
+                            total_projects += 1
+                            total_sessions += sessions
+                            total_messages += messages
+                            total_tool_uses += tool_uses
+
+                    except Exception as e:
+                        st.warning(f"⚠️ Error importing {project_name}: {e}")
+                        continue
+                    finally:
+                        # Drop this project's parsed entries before the next
+                        # iteration so memory stays bounded
+                        parsed_sessions = None
+                        current = None
+
+                    # Update progress
+                    progress_bar.progress((idx + 1) / len(project_dirs))
+
+            # Commit changes
+            conn.commit()
+
+            # Clear progress indicators
+            progress_bar.empty()
+            status_text.empty()
+
+            # Rebuild FTS index if any data was imported
+            if total_messages > 0:
+                status_text.text("🔍 Rebuilding search index...")
+                try:
+                    create_fts_index(str(db_path))
+                    status_text.empty()
+                except Exception as e:
+                    st.warning(f"⚠️ Failed to rebuild search index: {e}")
 
-            # Update progress
-            progress_bar.progress((idx + 1) / len(project_dirs))
+            return (total_projects, total_sessions, total_messages, total_tool_uses)
 
-        # Commit changes
-        conn.commit()
-        conn.close()
-
-        # Clear progress indicators
-        progress_bar.empty()
-        status_text.empty()
-
-        # Rebuild FTS index if any data was imported
-        if total_messages > 0:
-            status_text.text("🔍 Rebuilding search index...")
-            try:
-                create_fts_index(str(db_path))
-                status_text.empty()
-            except Exception as e:
-                st.warning(f"⚠️ Failed to rebuild search index: {e}")
-
-        return (total_projects, total_sessions, total_messages, total_tool_uses)
-
-    except Exception as e:
-        st.error(f"❌ Fatal error during import: {e}")
-        conn.rollback()
-        return (0, 0, 0, 0)
-    finally:
-        if conn:
-            conn.close()
+        except Exception as e:
+            st.error(f"❌ Fatal error during import: {e}")
+            conn.rollback()
+            return (0, 0, 0, 0)
 
 
 # Check for new data
@@ -235,6 +358,11 @@ if st.button("🚀 Run Import", type="primary", disabled=not has_new_data):
     with st.spinner("Importing conversations..."):
         projects, sessions, messages, tool_uses = run_import()
 
+    # The import changed the database - drop the cached detection result
+    # and its connection (create_database may have replaced the file)
+    _check_for_new_data_cached.clear()
+    _detection_conn.clear()
+
     # Display results
     st.divider()
     st.subheader("📊 Import Results")
@@ -9,13 +9,10 @@ from collections import defaultdict
 # Add parent directory to path for imports
 
 from claude_code_analytics import config
-from claude_code_analytics.streamlit_app.services import DatabaseService
+from claude_code_analytics.streamlit_app.services import DatabaseService, get_database_service
 
 # Initialize service
-if "db_service" not in st.session_state:
-    st.session_state.db_service = DatabaseService()
-
-db_service = st.session_state.db_service
+db_service = get_database_service()
 
 st.title("🔍 Search")
 
@@ -1,5 +1,7 @@
 """Service layer for business logic."""
 
+import streamlit as st
+
 from .database_service import DatabaseService
 from .analysis_service import AnalysisService
 from .llm_providers import (
@@ -9,6 +11,22 @@ from .llm_providers import (
     create_provider,
 )
 
+
+@st.cache_resource
+def get_database_service() -> DatabaseService:
+    """Process-wide DatabaseService singleton, shared across sessions
+    and threads instead of one instance per st.session_state."""
+    return DatabaseService()
+
+
+@st.cache_resource
+def get_analysis_service() -> AnalysisService:
+    """Process-wide AnalysisService singleton: keeps the Jinja
+    environment, prompt metadata, and database connection alive across
+    reruns and sessions."""
+    return AnalysisService()
+
+
 __all__ = [
     "DatabaseService",
     "AnalysisService",
@@ -16,4 +34,6 @@ __all__ = [
     "GeminiProvider",
     "OpenRouterProvider",
     "create_provider",
+    "get_database_service",
+    "get_analysis_service",
 ]
@@ -1,12 +1,14 @@
 """Analysis service layer for running LLM-powered analysis."""
 
 import os
+import sqlite3
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 from typing import Dict, Optional
 import yaml
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
 
 from claude_code_analytics.streamlit_app.models import AnalysisType, AnalysisResult, AnalysisTypeMetadata
 from claude_code_analytics.streamlit_app.services.llm_providers import LLMProvider, create_provider
@@ -40,6 +42,9 @@ class AnalysisService:
             db_path = str(Path.home() / "claude-conversations" / "conversations.db")
         self.db_path = db_path
 
+        # Lazily opened, long-lived connection (see _get_connection)
+        self._conn: Optional[sqlite3.Connection] = None
+
         # Load prompt metadata
         self.metadata, self.jinja_env = self._load_prompts()
 
@@ -70,8 +75,17 @@ class AnalysisService:
             key: AnalysisTypeMetadata(**value) for key, value in raw_metadata.items()
         }
 
-        # Create Jinja2 environment
-        env = Environment(loader=FileSystemLoader(str(prompts_dir)))
+        # Create Jinja2 environment. Templates never change at runtime, so
+        # skip the mtime check on every render and persist compiled template
+        # bytecode across processes.
+        bytecode_dir = Path(tempfile.gettempdir()) / "claude_code_analytics_jinja_cache"
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
+        env = Environment(
+            loader=FileSystemLoader(str(prompts_dir)),
+            auto_reload=False,
+            cache_size=400,
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+        )
 
         return metadata, env
 
@@ -79,6 +93,16 @@ class AnalysisService:
         """Get all available analysis types and their metadata."""
         return self.metadata
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get the service's long-lived database connection, opening it on
+        first use. The service instance is shared across reruns, so this
+        avoids a connect/close round-trip per analysis.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._conn
+
     def get_transcript_path(self, session_id: str) -> Optional[str]:
         """
         Get the transcript path for a session, generating it if needed.
@@ -89,13 +113,10 @@ class AnalysisService:
         Returns:
             Path to transcript file, or None if not found
         """
-        import sqlite3
-
         conversations_dir = Path.home() / "claude-conversations"
 
         # Get project info from database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._get_connection().cursor()
         cursor.execute(
             """
             SELECT p.project_id, p.project_name
@@ -107,7 +128,6 @@ class AnalysisService:
         )
 
         result = cursor.fetchone()
-        conn.close()
 
         if not result:
             return None
@@ -151,24 +171,14 @@ class AnalysisService:
         except subprocess.CalledProcessError:
             return None
 
-    def analyze_session(
+    def _build_prompt(
         self,
         session_id: str,
         analysis_type: AnalysisType,
         custom_prompt: Optional[str] = None,
-        model: Optional[str] = None,
-    ) -> AnalysisResult:
+    ) -> str:
         """
-        Analyze a session with the specified analysis type.
-
-        Args:
-            session_id: Session UUID
-            analysis_type: Type of analysis to perform
-            custom_prompt: Custom prompt text (required if analysis_type is CUSTOM)
-            model: Model to use (provider-specific). If None, uses provider's default.
-
-        Returns:
-            AnalysisResult with the analysis output
+        Build the full analysis prompt (transcript included) for a session.
 
         Raises:
             ValueError: If analysis type not found or custom_prompt missing
@@ -185,24 +195,55 @@ class AnalysisService:
         with open(transcript_path, "r", encoding="utf-8") as f:
             transcript = f.read()
 
-        # Build prompt based on analysis type
+        # Build prompt based on analysis type. Providers take a single
+        # string, so the best we can do for multi-MB transcripts is avoid
+        # holding extra full-size copies while assembling it.
         if analysis_type == AnalysisType.CUSTOM:
             if not custom_prompt:
                 raise ValueError("custom_prompt is required for CUSTOM analysis type")
-            # Automatically append the transcript
-            prompt = f"{custom_prompt}\n\n---\n\nCONVERSATION TRANSCRIPT:\n\n{transcript}"
-        else:
-            # Get metadata for this analysis type
-            metadata = self.metadata.get(analysis_type.value)
-            if not metadata:
-                raise ValueError(f"Unknown analysis type: {analysis_type}")
-
-            # Load and render Jinja2 template
-            try:
-                template = self.jinja_env.get_template(metadata.file)
-                prompt = template.render(transcript=transcript)
-            except TemplateNotFound:
-                raise ValueError(f"Template file not found: {metadata.file}")
+            # Automatically append the transcript; join instead of an
+            # f-string so the transcript isn't copied into an intermediate
+            return "".join(
+                (custom_prompt, "\n\n---\n\nCONVERSATION TRANSCRIPT:\n\n", transcript)
+            )
+
+        # Get metadata for this analysis type
+        metadata = self.metadata.get(analysis_type.value)
+        if not metadata:
+            raise ValueError(f"Unknown analysis type: {analysis_type}")
+
+        # Load and render Jinja2 template; generate() + join streams the
+        # render in chunks rather than materializing them twice
+        try:
+            template = self.jinja_env.get_template(metadata.file)
+            return "".join(template.generate(transcript=transcript))
+        except TemplateNotFound:
+            raise ValueError(f"Template file not found: {metadata.file}")
+
+    def analyze_session(
+        self,
+        session_id: str,
+        analysis_type: AnalysisType,
+        custom_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> AnalysisResult:
+        """
+        Analyze a session with the specified analysis type.
+
+        Args:
+            session_id: Session UUID
+            analysis_type: Type of analysis to perform
+            custom_prompt: Custom prompt text (required if analysis_type is CUSTOM)
+            model: Model to use (provider-specific). If None, uses provider's default.
+
+        Returns:
+            AnalysisResult with the analysis output
+
+        Raises:
+            ValueError: If analysis type not found or custom_prompt missing
+            FileNotFoundError: If transcript not found
+        """
+        prompt = self._build_prompt(session_id, analysis_type, custom_prompt)
 
         # Generate analysis using provider
         llm_response = self.provider.generate(prompt, model=model)
@@ -215,3 +256,22 @@ class AnalysisService:
             output_tokens=llm_response.output_tokens,
             model_name=llm_response.model_name,
         )
+
+    def analyze_session_stream(
+        self,
+        session_id: str,
+        analysis_type: AnalysisType,
+        custom_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        """
+        Stream a session analysis as partial text chunks.
+
+        Same prompt pipeline as analyze_session, but yields provider
+        output as it arrives so the first tokens render immediately
+        instead of after the full completion. Token usage, when the
+        backend reports it, is left on provider.last_stream_usage once
+        the stream is exhausted.
+        """
+        prompt = self._build_prompt(session_id, analysis_type, custom_prompt)
+        yield from self.provider.generate_stream(prompt, model=model)
@@ -2,6 +2,7 @@
 
 import sqlite3
 import sys
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -39,6 +40,14 @@ class DatabaseService:
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         conn.execute("PRAGMA foreign_keys = ON")
+        # WAL lets page reads proceed while an import is writing (the
+        # mode persists in the file; setting it per-open is a no-op
+        # after the first time), and NORMAL drops the per-transaction
+        # fsync that FULL pays - safe with WAL's checkpoint durability
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
         return conn
 
     # =========================================================================
@@ -54,11 +63,22 @@ class DatabaseService:
         conn.close()
         return [Project(**dict(row)) for row in rows]
 
-    def get_project_summaries(self) -> List[ProjectSummary]:
-        """Get project summaries with aggregated statistics."""
+    def get_project_summaries(self, top_n: Optional[int] = None) -> List[ProjectSummary]:
+        """
+        Get project summaries with aggregated statistics.
+
+        Args:
+            top_n: Optional cap - return only the N most active projects
+                by message count (limit applied in SQL, not in pandas)
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM project_summary ORDER BY total_messages DESC")
+        query = "SELECT * FROM project_summary ORDER BY total_messages DESC"
+        params = []
+        if top_n:
+            query += " LIMIT ?"
+            params.append(top_n)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         conn.close()
         return [ProjectSummary(**dict(row)) for row in rows]
@@ -135,25 +155,161 @@ class DatabaseService:
         conn.close()
         return [SessionSummary(**dict(row)) for row in rows]
 
+    def get_session_label_tuples(self, limit: int = 50) -> List[tuple]:
+        """
+        Get (session_id, project_name, start_time) tuples for recent sessions.
+
+        A narrow projection for building selector labels - dropdowns only
+        need these three columns, so skip fetching the full summary rows.
+
+        Args:
+            limit: Maximum number of sessions to return
+
+        Returns:
+            List of (session_id, project_name, start_time) tuples, newest first
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT session_id, project_name, start_time
+            FROM session_summary
+            ORDER BY start_time DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [tuple(row) for row in rows]
+
+    def get_session_detail(self, session_id: str) -> Optional[SessionSummary]:
+        """
+        Get the full summary for a single session (point lookup).
+
+        Args:
+            session_id: Session UUID
+
+        Returns:
+            SessionSummary or None if not found
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM session_summary WHERE session_id = ?", (session_id,)
+        )
+        row = cursor.fetchone()
+        conn.close()
+        return SessionSummary(**dict(row)) if row else None
+
     # =========================================================================
     # Message queries
     # =========================================================================
 
-    def get_messages_for_session(self, session_id: str) -> List[Message]:
-        """Get all messages for a session."""
+    @staticmethod
+    def _build_message_query(
+        session_id: str,
+        role: Optional[str] = None,
+        search: Optional[str] = None,
+        hide_empty: bool = False,
+    ) -> tuple[str, list]:
+        """Build the filtered message SELECT for a session."""
+        query = "SELECT * FROM messages WHERE session_id = ?"
+        params = [session_id]
+
+        if role:
+            query += " AND role = ?"
+            params.append(role)
+
+        if search:
+            # LIKE is case-insensitive for ASCII in SQLite, matching the
+            # previous Python-side .lower() substring filter. Escape LIKE
+            # metacharacters so '%' and '_' in the user's search stay
+            # literal substring matches rather than wildcards.
+            escaped = (
+                search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            query += " AND content LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+
+        if hide_empty:
+            # Drop content-empty messages unless they carry tool uses
+            query += (
+                " AND ((content IS NOT NULL AND TRIM(content) <> '')"
+                " OR message_index IN ("
+                "SELECT DISTINCT message_index FROM tool_uses WHERE session_id = ?))"
+            )
+            params.append(session_id)
+
+        query += " ORDER BY message_index"
+        return query, params
+
+    def get_messages_for_session(
+        self,
+        session_id: str,
+        role: Optional[str] = None,
+        search: Optional[str] = None,
+        hide_empty: bool = False,
+    ) -> List[Message]:
+        """
+        Get messages for a session, optionally filtered in SQL.
+
+        Args:
+            session_id: Session UUID
+            role: Optional role filter ('user' or 'assistant')
+            search: Optional case-insensitive content substring filter
+            hide_empty: Drop content-empty messages without tool uses
+
+        Returns:
+            List of messages ordered by message_index
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
+        query, params = self._build_message_query(session_id, role, search, hide_empty)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+        return [Message(**dict(row)) for row in rows]
+
+    def get_messages_and_tools_for_session(
+        self,
+        session_id: str,
+        role: Optional[str] = None,
+        search: Optional[str] = None,
+        hide_empty: bool = False,
+    ) -> tuple[List[Message], List[ToolUse]]:
+        """
+        Get messages and tool uses for a session in one round-trip.
+
+        Runs both SELECTs on a single connection instead of opening one
+        connection per query. Role and content filters apply to messages
+        only and are evaluated in SQL.
+
+        Args:
+            session_id: Session UUID
+            role: Optional role filter ('user' or 'assistant')
+            search: Optional case-insensitive content substring filter
+            hide_empty: Drop content-empty messages without tool uses
+
+        Returns:
+            Tuple of (messages, tool_uses)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        query, params = self._build_message_query(session_id, role, search, hide_empty)
+        cursor.execute(query, params)
+        messages = [Message(**dict(row)) for row in cursor.fetchall()]
         cursor.execute(
             """
-            SELECT * FROM messages
+            SELECT * FROM tool_uses
             WHERE session_id = ?
-            ORDER BY message_index
+            ORDER BY timestamp
             """,
             (session_id,),
         )
-        rows = cursor.fetchall()
+        tool_uses = [self._tool_use_from_row(row) for row in cursor.fetchall()]
         conn.close()
-        return [Message(**dict(row)) for row in rows]
+        return messages, tool_uses
 
     def get_token_usage_for_session(self, session_id: str) -> Dict[str, int]:
         """
@@ -196,6 +352,25 @@ class DatabaseService:
     # Tool use queries
     # =========================================================================
 
+    @staticmethod
+    def _tool_use_from_row(row) -> ToolUse:
+        """Build a ToolUse with its display truncation precomputed.
+
+        Doing the slice once at fetch time means render loops never
+        re-slice multi-MB tool outputs on every rerun.
+        """
+        tool = ToolUse(**dict(row))
+        if tool.tool_result:
+            max_length = config.TOOL_RESULT_MAX_LENGTH
+            if len(tool.tool_result) > max_length:
+                tool.tool_result_overflow = True
+                tool.tool_result_truncated = (
+                    tool.tool_result[:max_length] + "\n... (output truncated)"
+                )
+            else:
+                tool.tool_result_truncated = tool.tool_result
+        return tool
+
     def get_tool_uses_for_session(self, session_id: str) -> List[ToolUse]:
         """Get all tool uses for a session."""
         conn = self._get_connection()
@@ -210,13 +385,36 @@ class DatabaseService:
         )
         rows = cursor.fetchall()
         conn.close()
-        return [ToolUse(**dict(row)) for row in rows]
+        return [self._tool_use_from_row(row) for row in rows]
+
+    @staticmethod
+    def group_tools_by_message(tool_uses: List[ToolUse]) -> Dict[int, List[ToolUse]]:
+        """Bucket tool uses by the message index they belong to."""
+        tools_by_message: Dict[int, List[ToolUse]] = defaultdict(list)
+        for tool in tool_uses:
+            tools_by_message[tool.message_index].append(tool)
+        return dict(tools_by_message)
 
-    def get_tool_usage_summary(self) -> List[ToolUsageSummary]:
-        """Get aggregated tool usage statistics."""
+    def get_tool_uses_by_message_index(self, session_id: str) -> Dict[int, List[ToolUse]]:
+        """Get tool uses for a session bucketed by message index."""
+        return self.group_tools_by_message(self.get_tool_uses_for_session(session_id))
+
+    def get_tool_usage_summary(self, top_n: Optional[int] = None) -> List[ToolUsageSummary]:
+        """
+        Get aggregated tool usage statistics.
+
+        Args:
+            top_n: Optional cap - return only the N most-used tools
+                (the view is already ordered by total_uses DESC)
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tool_usage_summary")
+        query = "SELECT * FROM tool_usage_summary"
+        params = []
+        if top_n:
+            query += " LIMIT ?"
+            params.append(top_n)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         conn.close()
         return [ToolUsageSummary(**dict(row)) for row in rows]
@@ -686,3 +884,31 @@ class DatabaseService:
         rows = cursor.fetchall()
         conn.close()
         return [dict(row) for row in rows]
+
+    def get_period_totals(self, days: int = 30) -> Dict[str, int]:
+        """
+        Get whole-period totals for the last N days in one aggregate query.
+
+        Args:
+            days: Number of days to include
+
+        Returns:
+            Dict with sessions, messages, input_tokens and output_tokens sums
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                COUNT(DISTINCT session_id) as sessions,
+                COUNT(*) as messages,
+                SUM(COALESCE(input_tokens, 0)) as input_tokens,
+                SUM(COALESCE(output_tokens, 0)) as output_tokens
+            FROM messages
+            WHERE timestamp >= datetime('now', '-' || ? || ' days')
+            """,
+            (days,),
+        )
+        row = cursor.fetchone()
+        conn.close()
+        return {key: row[key] or 0 for key in row.keys()}
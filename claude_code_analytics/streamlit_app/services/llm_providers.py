@@ -2,7 +2,8 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
+import json
 import os
 
 import google.generativeai as genai
@@ -37,6 +38,20 @@ class LLMProvider(ABC):
         """
         pass
 
+    def generate_stream(self, prompt: str, model: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """
+        Stream generated text as it arrives.
+
+        Yields partial text chunks; after exhaustion, token usage (when
+        the backend reports it) is available as `self.last_stream_usage`.
+        The default implementation falls back to one blocking generate()
+        call and yields its text in a single chunk, so every provider is
+        stream-safe even without native support.
+        """
+        response = self.generate(prompt, model=model, **kwargs)
+        self.last_stream_usage = response
+        yield response.text
+
 
 class GeminiProvider(LLMProvider):
     """Google Gemini direct API provider."""
@@ -51,12 +66,16 @@ class GeminiProvider(LLMProvider):
         """
         self.api_key = api_key
         self.default_model = default_model
+        self._models = {}
         genai.configure(api_key=api_key)
 
     def generate(self, prompt: str, model: Optional[str] = None, **kwargs) -> LLMResponse:
         """Generate text using Gemini API."""
         model_name = model or self.default_model
-        gemini_model = genai.GenerativeModel(model_name)
+        # Reuse model handles across calls (matters for bulk analysis runs)
+        gemini_model = self._models.get(model_name)
+        if gemini_model is None:
+            gemini_model = self._models[model_name] = genai.GenerativeModel(model_name)
 
         # Generate with low temperature for deterministic output
         response = gemini_model.generate_content(
@@ -81,6 +100,35 @@ class GeminiProvider(LLMProvider):
             model_name=model_name,
         )
 
+    def generate_stream(self, prompt: str, model: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """Stream text chunks from the Gemini API."""
+        model_name = model or self.default_model
+        gemini_model = self._models.get(model_name)
+        if gemini_model is None:
+            gemini_model = self._models[model_name] = genai.GenerativeModel(model_name)
+
+        self.last_stream_usage = None
+        response = gemini_model.generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(
+                temperature=kwargs.get('temperature', 0.1)
+            ),
+            stream=True,
+        )
+
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+        # Usage metadata is populated once the stream is exhausted
+        usage_metadata = getattr(response, "usage_metadata", None)
+        self.last_stream_usage = LLMResponse(
+            text="",
+            input_tokens=getattr(usage_metadata, "prompt_token_count", None),
+            output_tokens=getattr(usage_metadata, "candidates_token_count", None),
+            model_name=model_name,
+        )
+
 
 class OpenRouterProvider(LLMProvider):
     """OpenRouter unified API provider."""
@@ -174,6 +222,76 @@ class OpenRouterProvider(LLMProvider):
             model_name=model_name,
         )
 
+    def generate_stream(self, prompt: str, model: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """Stream text deltas from OpenRouter's SSE endpoint."""
+        model_name = model or self.default_model
+
+        if not self.api_key:
+            raise ValueError("OpenRouter API key is not set")
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/yourusername/claude-code-utils",
+            "X-Title": "Claude Code Analytics",
+        }
+
+        payload = {
+            "model": model_name,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": kwargs.get('temperature', 0.1),
+            "stream": True,
+            # Ask for token accounting in the final SSE message
+            "usage": {"include": True},
+        }
+
+        self.last_stream_usage = None
+        input_tokens = None
+        output_tokens = None
+
+        with requests.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=300,
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                raise ValueError(
+                    f"OpenRouter API error (status {response.status_code}): {response.text}"
+                )
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+
+                usage = chunk.get("usage")
+                if usage:
+                    input_tokens = usage.get("prompt_tokens")
+                    output_tokens = usage.get("completion_tokens")
+
+                choices = chunk.get("choices")
+                if choices:
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+
+        self.last_stream_usage = LLMResponse(
+            text="",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            model_name=model_name,
+        )
+
     @staticmethod
     def fetch_all_models() -> list[dict]:
         """
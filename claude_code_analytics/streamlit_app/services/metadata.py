@@ -0,0 +1,75 @@
+"""Traceability metadata helpers for analysis output."""
+
+import functools
+import subprocess
+from datetime import datetime
+
+
+ANALYSIS_METADATA_TEMPLATE = """# {analysis_name}
+
+## Traceability Information
+
+- **Project:** {project_name}
+- **Session ID:** `{session_id}`
+- **Analysis Type:** `{analysis_type}`
+- **Generated:** {timestamp}
+- **LLM Provider:** {provider_name}
+- **Model:** `{model_name}`
+- **Input Tokens:** {input_tokens:,}
+- **Output Tokens:** {output_tokens:,}
+- **Tool Version:** `{short_commit}`
+- **Full Commit:** `{git_commit}`
+
+---
+
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_git_commit_id() -> str:
+    """Get current git commit ID (memoized - the commit can't change
+    under a running server, so fork/exec git once, not per analysis)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+        return "unknown"
+    except Exception:
+        return "unknown"
+
+
+def format_analysis_with_metadata(
+    result_text: str,
+    analysis_type: str,
+    analysis_name: str,
+    session_id: str,
+    project_name: str,
+    model_name: str,
+    provider_name: str,
+    input_tokens: int,
+    output_tokens: int,
+) -> str:
+    """Format analysis result with traceability metadata."""
+    git_commit = get_git_commit_id()
+
+    metadata = ANALYSIS_METADATA_TEMPLATE.format(
+        analysis_name=analysis_name,
+        project_name=project_name,
+        session_id=session_id,
+        analysis_type=analysis_type,
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        provider_name=provider_name,
+        model_name=model_name,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        short_commit=git_commit[:8],
+        git_commit=git_commit,
+    )
+
+    # join avoids a second full copy of result_text (can be hundreds of KB)
+    return "".join((metadata, result_text))